@@ -151,6 +151,10 @@ build_unix_port() {
     export CFLAGS_EXTRA="-DLV_CONF_INCLUDE_SIMPLE=1 -DLV_USE_SDL=1 $SDL_CFLAGS"
     export LDFLAGS_EXTRA="$SDL_LDFLAGS"
 
+    # The port defaults to -Os; the desktop simulator favours speed over size
+    # (override with COPT=... in the environment)
+    export COPT="${COPT:--O2 -DNDEBUG}"
+
     # Clean previous build
     make clean || true
 
@@ -158,6 +162,7 @@ build_unix_port() {
     log_info "Building MicroPython with LVGL user module..."
     make -j$(nproc) \
         USER_C_MODULES=../../user_modules \
+        COPT="$COPT" \
         CFLAGS_EXTRA="$CFLAGS_EXTRA" \
         LDFLAGS_EXTRA="$LDFLAGS_EXTRA" \
         V=1
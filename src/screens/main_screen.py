@@ -12,6 +12,9 @@ from utils.error_handler import error_handler
 class MainScreen(BaseScreen):
     """Main application screen with toolbar and tool display area"""
 
+    # Widgets the PRD requires create_ui to register in self.widgets
+    REQUIRED_WIDGETS = ('toolbar', 'menu_btn', 'title_btn', 'wifi_icon', 'main_area')
+
     def __init__(self, scr):
         self.current_tool_screen = None
         super().__init__(scr)
@@ -16,6 +16,8 @@ class SystemSelectionScreen(BaseScreen):
         self.current_view = "brands"  # "brands" or "systems"
         self.selected_brand = None
         self.all_systems = []  # Cache of all systems for search
+        self._search_index = []  # Lowercased search text for each entry of all_systems
+        self._last_display_key = None  # What the list currently shows
         super().__init__(scr)
 
     def create_ui(self):
@@ -126,26 +128,46 @@ class SystemSelectionScreen(BaseScreen):
                             'system_type': system_type,
                             'system_name': system_name
                         })
+
+            # Lowercase once here rather than on every keystroke; the newline
+            # separator stops a match from spanning two fields
+            self._search_index = [
+                f"{s['brand']}\n{s['system_type']}\n{s['system_name']}".lower()
+                for s in self.all_systems
+            ]
         except Exception as e:
             app_state.error_handler.handle_error(e, "Failed to load systems")
 
     def update_list_display(self):
         """Update the list display based on search state"""
         try:
+            # Skip the rebuild if the list already shows this state
+            if self.is_searching and self.search_text:
+                key = ("search", self.search_text)
+            else:
+                key = (self.current_view, self.selected_brand)
+            if key == self._last_display_key:
+                return
+
             # Clear current list by cleaning all children
             list_container = self.widgets['list_container']
             list_container.clean()
+            self._last_display_key = None
 
+            shown = True
             if self.is_searching and self.search_text:
                 # Show filtered systems
                 # Back button acts as close when searching
-                self.display_filtered_systems()
+                shown = self.display_filtered_systems()
             elif self.current_view == "brands":
                 # Show brands - back button acts as close
-                self.display_brands()
+                shown = self.display_brands()
             elif self.current_view == "systems" and self.selected_brand:
                 # Show systems for selected brand - back button goes back to brands
-                self.display_brand_systems()
+                shown = self.display_brand_systems()
+            # Only remember a fully built list, so a failed build is retried
+            if shown:
+                self._last_display_key = key
 
         except Exception as e:
             app_state.error_handler.handle_error(e, "Failed to update list display")
@@ -172,8 +194,11 @@ class SystemSelectionScreen(BaseScreen):
 
                 y_pos += 50  # 45px button + 5px margin
 
+            return True
+
         except Exception as e:
             app_state.error_handler.handle_error(e, "Failed to display brands")
+            return False
 
     def display_brand_systems(self):
         """Display systems for selected brand sorted by type and name"""
@@ -210,8 +235,11 @@ class SystemSelectionScreen(BaseScreen):
 
                 y_pos += 50  # 45px button + 5px margin
 
+            return True
+
         except Exception as e:
             app_state.error_handler.handle_error(e, "Failed to display brand systems")
+            return False
 
     def display_filtered_systems(self):
         """Display systems matching search filter"""
@@ -219,11 +247,9 @@ class SystemSelectionScreen(BaseScreen):
             filtered_systems = []
             search_lower = self.search_text.lower()
 
-            for system in self.all_systems:
+            for system, haystack in zip(self.all_systems, self._search_index):
                 # Search in brand, system type, and system name
-                if (search_lower in system['brand'].lower() or
-                    search_lower in system['system_type'].lower() or
-                    search_lower in system['system_name'].lower()):
+                if search_lower in haystack:
                     filtered_systems.append(system)
 
             # Sort by brand, system type, then system name
@@ -246,8 +272,11 @@ class SystemSelectionScreen(BaseScreen):
 
                 y_pos += 50  # 45px button + 5px margin
 
+            return True
+
         except Exception as e:
             app_state.error_handler.handle_error(e, "Failed to display filtered systems")
+            return False
 
     # Event Handlers
     def on_back_click(self, e):
@@ -273,15 +302,19 @@ class SystemSelectionScreen(BaseScreen):
         except Exception as ex:
             app_state.error_handler.handle_error(ex, "Failed to handle search text change")
 
+    def reset_state(self):
+        """Clear the search and selection and show the brand list again"""
+        self.search_text = ""
+        self.is_searching = False
+        self.current_view = "brands"
+        self.selected_brand = None
+        self.update_list_display()
+
     def on_clear_search(self, e):
         """Clear search text and return to brand view"""
         try:
             self.widgets['search_display'].set_text("")
-            self.search_text = ""
-            self.is_searching = False
-            self.current_view = "brands"
-            self.selected_brand = None
-            self.update_list_display()
+            self.reset_state()
         except Exception as ex:
             app_state.error_handler.handle_error(ex, "Failed to clear search")
 
@@ -184,11 +184,14 @@ class DataManager:
         Returns:
             list: Sorted list of unique brands
         """
-        systems_db = self.load_systems()
-        brands = set()
-        for system in systems_db.get("systems", []):
-            brands.add(system.get("brand"))
-        return sorted(list(brands))
+        if 'brands' not in self._cache:
+            systems_db = self.load_systems()
+            brands = set()
+            for system in systems_db.get("systems", []):
+                brands.add(system.get("brand"))
+            self._cache['brands'] = tuple(sorted(brands))
+        # Hand out a copy so callers can't mutate the cached result
+        return list(self._cache['brands'])
     
     def get_systems_for_brand(self, brand):
         """
@@ -222,12 +225,15 @@ class DataManager:
         Returns:
             list: Sorted list of system types for the brand
         """
-        systems_db = self.load_systems()
-        types = set()
-        for system in systems_db.get("systems", []):
-            if system.get("brand") == brand:
-                types.add(system.get("type"))
-        return sorted(list(types))
+        types_by_brand = self._cache.setdefault('system_types', {})
+        if brand not in types_by_brand:
+            systems_db = self.load_systems()
+            types = set()
+            for system in systems_db.get("systems", []):
+                if system.get("brand") == brand:
+                    types.add(system.get("type"))
+            types_by_brand[brand] = tuple(sorted(types))
+        return list(types_by_brand[brand])
     
     def get_system_names(self, brand, system_type):
         """
@@ -240,13 +246,17 @@ class DataManager:
         Returns:
             list: Sorted list of system names
         """
-        systems_db = self.load_systems()
-        names = set()
-        for system in systems_db.get("systems", []):
-            if (system.get("brand") == brand and 
-                system.get("type") == system_type):
-                names.add(system.get("system_name"))
-        return sorted(list(names))
+        names_by_key = self._cache.setdefault('system_names', {})
+        key = (brand, system_type)
+        if key not in names_by_key:
+            systems_db = self.load_systems()
+            names = set()
+            for system in systems_db.get("systems", []):
+                if (system.get("brand") == brand and 
+                    system.get("type") == system_type):
+                    names.add(system.get("system_name"))
+            names_by_key[key] = tuple(sorted(names))
+        return list(names_by_key[key])
     
     def get_system_tools(self, brand, system_type, system_name):
         """
@@ -268,6 +278,30 @@ class DataManager:
                 return system.get("tools", [])
         return []
     
+    @property
+    def first_brand(self):
+        """First brand in sorted order, or None if there are no systems"""
+        if 'brands' not in self._cache:
+            self.get_brands()
+        brands = self._cache['brands']
+        return brands[0] if brands else None
+    
+    def first_system_type(self, brand):
+        """First system type for a brand in sorted order, or None"""
+        types = self._cache.get('system_types', {}).get(brand)
+        if types is None:
+            self.get_system_types(brand)
+            types = self._cache['system_types'][brand]
+        return types[0] if types else None
+    
+    def first_system_name(self, brand, system_type):
+        """First system name for a brand and type in sorted order, or None"""
+        names = self._cache.get('system_names', {}).get((brand, system_type))
+        if names is None:
+            self.get_system_names(brand, system_type)
+            names = self._cache['system_names'][(brand, system_type)]
+        return names[0] if names else None
+    
     def get_tool_config(self, brand, system_type, system_name, tool_name):
         """
         Get configuration for a specific tool
@@ -12,15 +12,20 @@ except ImportError:
     import sys
 import lvgl as lv
 
-# Add src and test directories to path
-sys.path.append('src')
-sys.path.append('test')
+# Add src and test directories to the front of the path (once)
+for _path in ('src', 'test'):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+# Banner separators, built once per process
+_SEP50 = '=' * 50
+_NL_SEP50 = '\n' + _SEP50
 
 def quick_test():
     """Run quick UI tests for critical functionality"""
-    print("=" * 50)
+    print(_SEP50)
     print("ECU DIAGNOSTIC TOOL - QUICK UI TEST")
-    print("=" * 50)
+    print(_SEP50)
     
     # Initialize LVGL
     lv.init()
@@ -98,9 +103,8 @@ def quick_test():
         test_results.append(("System Selection", f"ERROR: {e}"))
     
     # Print Results
-    print("\n" + "=" * 50)
-    print("QUICK TEST RESULTS")
-    print("=" * 50)
+    out = [_NL_SEP50, "QUICK TEST RESULTS", _SEP50]
+    w = out.append
     
     passed = 0
     failed = 0
@@ -108,27 +112,29 @@ def quick_test():
     
     for test_name, result in test_results:
         if result == "PASS":
-            print(f"✓ {test_name}: PASSED")
+            w(f"✓ {test_name}: PASSED")
             passed += 1
         elif result == "FAIL":
-            print(f"✗ {test_name}: FAILED")
+            w(f"✗ {test_name}: FAILED")
             failed += 1
         else:
-            print(f"⚠ {test_name}: {result}")
+            w(f"⚠ {test_name}: {result}")
             errors += 1
     
     total = len(test_results)
     success_rate = (passed / total * 100) if total > 0 else 0
     
-    print(f"\nSummary: {passed}/{total} tests passed ({success_rate:.1f}%)")
-    print(f"Failed: {failed}, Errors: {errors}")
+    w(f"\nSummary: {passed}/{total} tests passed ({success_rate:.1f}%)")
+    w(f"Failed: {failed}, Errors: {errors}")
     
-    if failed == 0 and errors == 0:
-        print("\n🎉 Quick test PASSED - Core UI functionality working!")
-        return True
+    success = failed == 0 and errors == 0
+    if success:
+        w("\n🎉 Quick test PASSED - Core UI functionality working!")
     else:
-        print("\n❌ Quick test FAILED - Issues detected in core UI")
-        return False
+        w("\n❌ Quick test FAILED - Issues detected in core UI")
+    
+    sys.stdout.write('\n'.join(out) + '\n')
+    return success
 
 if __name__ == "__main__":
     success = quick_test()
@@ -8,72 +8,152 @@ import utime as time
 import usys as sys
 import lvgl as lv
 import ujson as json
+try:
+    import uarray as array
+except ImportError:
+    import array
+try:
+    import uos as os
+except ImportError:
+    import os
 
-# Add src and test directories to path
-sys.path.append('src')
-sys.path.append('test')
+# Add src and test directories to the front of the path (once)
+for _path in ('src', 'test'):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+# Banner separators, built once per process
+_SEP40 = '=' * 40
+_SEP50 = '=' * 50
+_SEP60 = '=' * 60
+_NL_SEP40 = '\n' + _SEP40
+_NL_SEP50 = '\n' + _SEP50
+_NL_SEP60 = '\n' + _SEP60
+
+# Per-feature coverage listing is only printed on request (--verbose or
+# RPMSIM_UI_VERBOSE=1); UART output dominates report time on device
+_getenv = getattr(os, 'getenv', None)
+_VERBOSE = '--verbose' in getattr(sys, 'argv', ()) or (
+    _getenv is not None and _getenv('RPMSIM_UI_VERBOSE', '0') not in ('', '0'))
 
 from ui.utils.base_ui_test import BaseUITest
 
+class FatalImportError(Exception):
+    """Raised when a package shared by every test module cannot be imported"""
+    pass
+
+# Top-level packages every test module imports from; when one of these is
+# missing (e.g. a bad sys.path) every later module fails the same way
+_FATAL_IMPORTS = ('screens', 'utils', 'ui')
+
+def _missing_module(error):
+    """Name of the module an ImportError could not find"""
+    # MicroPython's ImportError has no .name, fall back to the quoted name in the message
+    name = getattr(error, 'name', None)
+    if name:
+        return name
+    message = str(error)
+    if "'" in message:
+        return message.split("'")[1]
+    return message
+
+def _is_fatal_import(error):
+    """Check whether an ImportError is for a whole shared package, not one module in it"""
+    return _missing_module(error) in _FATAL_IMPORTS
+
+# Test modules run by the suite; resolved classes are cached under '_cls'
+TEST_MODULES = [
+    {
+        'name': 'Main Screen UI Tests',
+        'module': 'ui.test_main_screen',
+        'class': 'MainScreenUITest',
+        'description': 'Tests toolbar, menu, navigation, and tool loading'
+    },
+    {
+        'name': 'RPM Simulator UI Tests',
+        'module': 'ui.test_rpm_simulator_screen',
+        'class': 'RPMSimulatorUITest',
+        'description': 'Tests RPM slider, buttons, toggles, and simulation'
+    },
+    {
+        'name': 'System Selection UI Tests',
+        'module': 'ui.test_system_selection_screen',
+        'class': 'SystemSelectionUITest',
+        'description': 'Tests brand and system lists and navigation'
+    },
+    {
+        'name': 'WiFi Setup UI Tests',
+        'module': 'ui.test_wifi_setup_screen',
+        'class': 'WiFiSetupUITest',
+        'description': 'Tests network scanning, selection, and connection'
+    },
+    {
+        'name': 'Additional Screens UI Tests',
+        'module': 'ui.test_additional_screens',
+        'class': 'AdditionalScreensUITest',
+        'description': 'Tests firmware update, system info, DTC, and config screens'
+    }
+]
+
+def _resolve_test_class(test_info):
+    """Import a test module once and cache its test class on the entry"""
+    test_class = test_info.get('_cls')
+    if test_class is None:
+        __import__(test_info['module'])
+        test_class = getattr(sys.modules[test_info['module']], test_info['class'])
+        test_info['_cls'] = test_class
+    return test_class
+
 class UITestRunner:
     """Comprehensive UI test runner with coverage reporting"""
     
+    # Counter names are properties over _counts, so they are not slots
+    __slots__ = ('test_results', '_counts', 'start_time', 'end_time', '_overall_sr')
+    
     def __init__(self):
         self.test_results = []
-        self.total_tests = 0
-        self.passed_tests = 0
-        self.failed_tests = 0
-        self.error_tests = 0
+        # Counters in one buffer: total, passed, failed, errors
+        self._counts = array.array('l', [0, 0, 0, 0])
         self.start_time = None
         self.end_time = None
+        self._overall_sr = 0
+    
+    @property
+    def total_tests(self):
+        """Total tests executed"""
+        return self._counts[0]
+    
+    @property
+    def passed_tests(self):
+        """Tests passed"""
+        return self._counts[1]
+    
+    @property
+    def failed_tests(self):
+        """Tests failed"""
+        return self._counts[2]
+    
+    @property
+    def error_tests(self):
+        """Tests with errors"""
+        return self._counts[3]
     
     def run_all_tests(self):
         """Run all UI tests and generate comprehensive report"""
         try:
             self.start_time = time.time()
-            print("=" * 60)
+            print(_SEP60)
             print("ECU DIAGNOSTIC TOOL - COMPREHENSIVE UI TEST SUITE")
-            print("=" * 60)
+            print(_SEP60)
             print(f"Started at: {time.localtime()}")
             print()
             
-            # Define all test modules
-            test_modules = [
-                {
-                    'name': 'Main Screen UI Tests',
-                    'module': 'ui.test_main_screen',
-                    'class': 'MainScreenUITest',
-                    'description': 'Tests toolbar, menu, navigation, and tool loading'
-                },
-                {
-                    'name': 'RPM Simulator UI Tests',
-                    'module': 'ui.test_rpm_simulator_screen',
-                    'class': 'RPMSimulatorUITest',
-                    'description': 'Tests RPM slider, buttons, toggles, and simulation'
-                },
-                {
-                    'name': 'System Selection UI Tests',
-                    'module': 'ui.test_system_selection_screen',
-                    'class': 'SystemSelectionUITest',
-                    'description': 'Tests 4-step selection process and navigation'
-                },
-                {
-                    'name': 'WiFi Setup UI Tests',
-                    'module': 'ui.test_wifi_setup_screen',
-                    'class': 'WiFiSetupUITest',
-                    'description': 'Tests network scanning, selection, and connection'
-                },
-                {
-                    'name': 'Additional Screens UI Tests',
-                    'module': 'ui.test_additional_screens',
-                    'class': 'AdditionalScreensUITest',
-                    'description': 'Tests firmware update, system info, DTC, and config screens'
-                }
-            ]
-            
             # Run each test module
-            for test_info in test_modules:
-                self.run_test_module(test_info)
+            try:
+                for test_info in TEST_MODULES:
+                    self.run_test_module(test_info)
+            except FatalImportError as e:
+                print(f"Aborting test run: {e}")
             
             # Generate final report
             self.generate_final_report()
@@ -87,15 +167,14 @@ class UITestRunner:
     def run_test_module(self, test_info):
         """Run a single test module"""
         try:
-            print(f"\n{'='*50}")
+            print(_NL_SEP50)
             print(f"RUNNING: {test_info['name']}")
-            print(f"{'='*50}")
+            print(_SEP50)
             print(f"Description: {test_info['description']}")
             print()
             
-            # Import test module dynamically
-            module = __import__(test_info['module'], fromlist=[test_info['class']])
-            test_class = getattr(module, test_info['class'])
+            # Import test module (cached after first resolution)
+            test_class = _resolve_test_class(test_info)
             
             # Create and run test instance
             test_instance = test_class()
@@ -110,10 +189,11 @@ class UITestRunner:
             })
             
             # Update counters
-            self.total_tests += summary['total']
-            self.passed_tests += summary['passed']
-            self.failed_tests += summary['failed']
-            self.error_tests += summary['errors']
+            c = self._counts
+            c[0] += summary['total']
+            c[1] += summary['passed']
+            c[2] += summary['failed']
+            c[3] += summary['errors']
             
             # Print module summary
             status = "PASSED" if success else "FAILED"
@@ -123,10 +203,12 @@ class UITestRunner:
             
         except ImportError as e:
             print(f"Failed to import {test_info['module']}: {e}")
-            self.error_tests += 1
+            self._counts[3] += 1
+            if _is_fatal_import(e):
+                raise FatalImportError(f"{test_info['module']}: {e}")
         except Exception as e:
             print(f"Test module {test_info['name']} crashed: {e}")
-            self.error_tests += 1
+            self._counts[3] += 1
     
     def generate_final_report(self):
         """Generate comprehensive final test report"""
@@ -134,30 +216,37 @@ class UITestRunner:
             self.end_time = time.time()
             duration = self.end_time - self.start_time
             
-            print(f"\n{'='*60}")
-            print("COMPREHENSIVE UI TEST REPORT")
-            print(f"{'='*60}")
+            out = []
+            w = out.append
+            w(_NL_SEP60)
+            w("COMPREHENSIVE UI TEST REPORT")
+            w(_SEP60)
             
             # Overall statistics
-            print(f"Total Test Duration: {duration:.2f} seconds")
-            print(f"Total Tests Executed: {self.total_tests}")
-            print(f"Tests Passed: {self.passed_tests}")
-            print(f"Tests Failed: {self.failed_tests}")
-            print(f"Tests with Errors: {self.error_tests}")
+            w(f"Total Test Duration: {duration:.2f} seconds")
+            w(f"Total Tests Executed: {self.total_tests}")
+            w(f"Tests Passed: {self.passed_tests}")
+            w(f"Tests Failed: {self.failed_tests}")
+            w(f"Tests with Errors: {self.error_tests}")
             
+            # Computed once, reused by recommendations and the saved report
             overall_success_rate = (self.passed_tests / self.total_tests * 100) if self.total_tests > 0 else 0
-            print(f"Overall Success Rate: {overall_success_rate:.1f}%")
+            self._overall_sr = overall_success_rate
+            w(f"Overall Success Rate: {overall_success_rate:.1f}%")
             
             # Module breakdown
-            print(f"\n{'='*40}")
-            print("MODULE BREAKDOWN")
-            print(f"{'='*40}")
+            w(_NL_SEP40)
+            w("MODULE BREAKDOWN")
+            w(_SEP40)
             
             for result in self.test_results:
                 status = "✓ PASS" if result['success'] else "✗ FAIL"
                 summary = result['summary']
-                print(f"{status} {result['module']}")
-                print(f"    Tests: {summary['total']}, Success Rate: {summary['success_rate']:.1f}%")
+                w(f"{status} {result['module']}")
+                w(f"    Tests: {summary['total']}, Success Rate: {summary['success_rate']:.1f}%")
+            
+            # Single write instead of one print per line
+            sys.stdout.write('\n'.join(out) + '\n')
             
             # Coverage analysis
             self.generate_coverage_report()
@@ -174,10 +263,6 @@ class UITestRunner:
     def generate_coverage_report(self):
         """Generate UI coverage analysis"""
         try:
-            print(f"\n{'='*40}")
-            print("UI COVERAGE ANALYSIS")
-            print(f"{'='*40}")
-            
             # Define UI features that should be tested
             ui_features = {
                 'Main Screen': [
@@ -198,11 +283,9 @@ class UITestRunner:
                 ],
                 'System Selection': [
                     'Brand selection',
-                    'System type selection',
-                    'System name selection',
-                    'Tool selection',
+                    'Systems list',
                     'Back navigation',
-                    'Breadcrumb updates'
+                    'List updates'
                 ],
                 'WiFi Setup': [
                     'Network scanning',
@@ -229,20 +312,26 @@ class UITestRunner:
                 if module_name in ui_features:
                     # Estimate coverage based on success rate
                     module_features = len(ui_features[module_name])
-                    success_rate = result['summary']['success_rate'] / 100
-                    covered_features += module_features * success_rate
+                    covered_features += module_features * result['summary']['success_rate'] * 0.01
             
             coverage_percentage = (covered_features / total_features * 100) if total_features > 0 else 0
             
-            print(f"Estimated UI Feature Coverage: {coverage_percentage:.1f}%")
-            print(f"Total UI Features: {total_features}")
-            print(f"Covered Features: {covered_features:.1f}")
+            out = [
+                _NL_SEP40,
+                "UI COVERAGE ANALYSIS",
+                _SEP40,
+                f"Estimated UI Feature Coverage: {coverage_percentage:.1f}%",
+                f"Total UI Features: {total_features}",
+                f"Covered Features: {covered_features:.1f}",
+            ]
             
             # Feature breakdown
-            for screen, features in ui_features.items():
-                print(f"\n{screen}:")
-                for feature in features:
-                    print(f"  • {feature}")
+            if _VERBOSE:
+                for screen, features in ui_features.items():
+                    out.append(f"\n{screen}:")
+                    out.extend(f"  • {feature}" for feature in features)
+            
+            sys.stdout.write('\n'.join(out) + '\n')
             
         except Exception as e:
             print(f"Coverage analysis failed: {e}")
@@ -250,9 +339,9 @@ class UITestRunner:
     def generate_recommendations(self):
         """Generate recommendations based on test results"""
         try:
-            print(f"\n{'='*40}")
+            print(_NL_SEP40)
             print("RECOMMENDATIONS")
-            print(f"{'='*40}")
+            print(_SEP40)
             
             recommendations = []
             
@@ -263,8 +352,7 @@ class UITestRunner:
             if self.error_tests > 0:
                 recommendations.append(f"• Resolve {self.error_tests} test error(s) - may indicate missing implementations")
             
-            overall_success_rate = (self.passed_tests / self.total_tests * 100) if self.total_tests > 0 else 0
-            if overall_success_rate < 90:
+            if self._overall_sr < 90:
                 recommendations.append("• Improve test success rate to at least 90% for production readiness")
             
             # Module-specific recommendations
@@ -301,7 +389,7 @@ class UITestRunner:
                     'passed_tests': self.passed_tests,
                     'failed_tests': self.failed_tests,
                     'error_tests': self.error_tests,
-                    'success_rate': (self.passed_tests / self.total_tests * 100) if self.total_tests > 0 else 0
+                    'success_rate': self._overall_sr
                 },
                 'module_results': self.test_results
             }
@@ -335,12 +423,12 @@ def main():
     success = runner.run_all_tests()
     
     # Final status
-    print(f"\n{'='*60}")
+    print(_NL_SEP60)
     if success:
         print("🎉 ALL UI TESTS COMPLETED SUCCESSFULLY!")
     else:
         print("❌ SOME UI TESTS FAILED - REVIEW RESULTS ABOVE")
-    print(f"{'='*60}")
+    print(_SEP60)
     
     return success
 
@@ -14,6 +14,46 @@ sys.path.append('test')
 
 from ui.utils.base_ui_test import BaseUITest
 from ui.utils.test_helpers import UITestHelpers
+from utils.navigation_manager import app_state
+
+# Screens under test: (key, module, class name)
+_SCREEN_MODULES = (
+    ('firmware', 'screens.firmware_update', 'FirmwareUpdateScreen'),
+    ('system_info', 'screens.system_info', 'SystemInfoScreen'),
+    ('clear_dtc', 'screens.dtc.clear_dtc', 'ClearDTCScreen'),
+    ('read_dtc', 'screens.dtc.read_dtc', 'ReadDTCScreen'),
+    ('live_data', 'screens.live_data.read_live_data', 'ReadLiveDataScreen'),
+    ('rpm_sensor_config', 'screens.rpm_sensor_config', 'RPMSensorConfigScreen'),
+)
+
+# Texts that count as a navigation element on a screen
+_NAV_SET = frozenset(('Back', 'Cancel', 'Close', 'Done'))
+
+# Expected elements per screen: (type, text, name)
+_FIRMWARE_ELEMENTS = (
+    ('label', 'Firmware Update', 'title'),
+    ('button', 'Check for Updates', 'check button'),
+    ('button', 'Download', 'download button'),
+    ('button', 'Install', 'install button'),
+)
+_SYSTEM_INFO_ELEMENTS = (
+    ('label', 'System Information', 'title'),
+    ('label', 'Version', 'version label'),
+    ('label', 'Hardware', 'hardware label'),
+    ('label', 'Memory', 'memory label'),
+)
+_LIVE_DATA_ELEMENTS = (
+    ('label', 'Live Data', 'title'),
+    ('button', 'Start', 'start button'),
+    ('button', 'Stop', 'stop button'),
+    ('button', 'Refresh', 'refresh button'),
+)
+_SENSOR_CONFIG_ELEMENTS = (
+    ('label', 'Sensor Configuration', 'title'),
+    ('label', 'Crankshaft', 'crankshaft label'),
+    ('label', 'Camshaft', 'camshaft label'),
+    ('button', 'Save', 'save button'),
+)
 
 class AdditionalScreensUITest(BaseUITest):
     """Test suite for additional screen UI functionality"""
@@ -21,21 +61,26 @@ class AdditionalScreensUITest(BaseUITest):
     def __init__(self):
         super().__init__("Additional Screens UI Test")
         self.app_state = None
+        self._screen_classes = self._load_screen_classes()
+        # Navigation text found per screen class, filled by the screen tests
+        self._nav_results = {}
+    
+    def _load_screen_classes(self):
+        """Import each screen module once, storing None for missing screens"""
+        screen_classes = {}
+        for key, module_name, class_name in _SCREEN_MODULES:
+            try:
+                __import__(module_name)
+                screen_classes[key] = getattr(sys.modules[module_name], class_name)
+            except ImportError:
+                screen_classes[key] = None
+        return screen_classes
     
     def setup_test_environment(self):
         """Set up test environment"""
         try:
-            # Import required modules
-            from utils.navigation_manager import AppState, app_state
-            from utils.data_manager import DataManager
-            from utils.error_handler import ErrorHandler
-
-            # Use global app_state instance and initialize it
+            # Use global app_state instance
             self.app_state = app_state
-            if not hasattr(self.app_state, 'data_manager') or not self.app_state.data_manager:
-                self.app_state.data_manager = DataManager()
-            if not hasattr(self.app_state, 'error_handler') or not self.app_state.error_handler:
-                self.app_state.error_handler = ErrorHandler()
 
             self.log_pass("Additional screens test environment setup completed")
             return True
@@ -44,48 +89,51 @@ class AdditionalScreensUITest(BaseUITest):
             self.log_error(f"Test environment setup failed: {e}")
             return False
     
+    def wait_for_screen_text(self, text, timeout_ms=500):
+        """Wait until a widget with the given text is in the widget tree"""
+        return self.wait_until(
+            lambda: UITestHelpers.find_widget_by_text(self.screen, text) is not None,
+            timeout_ms)
+    
+    def record_navigation(self, screen_class, text_index):
+        """Record which navigation element (if any) a screen exposes"""
+        hits = _NAV_SET.intersection(text_index)
+        self._nav_results[screen_class] = sorted(hits)[0] if hits else None
+    
     def test_firmware_update_screen(self):
         """Test firmware update screen"""
         try:
             self.log_info("Testing firmware update screen...")
             
-            # Import and create firmware update screen
-            from screens.firmware_update import FirmwareUpdateScreen
-            firmware_screen = FirmwareUpdateScreen(self.screen)
-            
-            # Wait for screen to initialize
-            self.wait_for_ui_update(500)
-            
-            # Test basic elements
-            expected_elements = [
-                {'type': 'label', 'text': 'Firmware Update', 'name': 'title'},
-                {'type': 'button', 'text': 'Check for Updates', 'name': 'check button'},
-                {'type': 'button', 'text': 'Download', 'name': 'download button'},
-                {'type': 'button', 'text': 'Install', 'name': 'install button'}
-            ]
-            
-            # Verify elements exist (some may be hidden initially)
-            for element in expected_elements:
-                widget = UITestHelpers.find_widget_by_text(self.screen, element['text'])
-                if widget:
-                    self.log_pass(f"Found {element['name']}")
-                else:
-                    self.log_info(f"{element['name']} not found (may be context-dependent)")
-            
-            # Test check for updates button if available
-            check_btn = UITestHelpers.find_button_by_text(self.screen, "Check for Updates")
-            if check_btn:
-                self.simulate_click(check_btn)
-                self.wait_for_ui_update(500)
-                self.log_pass("Check for updates button interaction completed")
+            # Create firmware update screen
+            FirmwareUpdateScreen = self._screen_classes['firmware']
+            if FirmwareUpdateScreen is None:
+                self.log_info("Firmware update screen not implemented yet")
+                return True
+            with self.managed_screen(FirmwareUpdateScreen):
+                # Wait for screen to initialize
+                self.wait_for_screen_text("Firmware Update")
+                
+                # Verify elements exist (some may be hidden initially)
+                text_index = UITestHelpers.build_text_index(self.screen)
+                for element_type, element_text, element_name in _FIRMWARE_ELEMENTS:
+                    widget = text_index.get(element_text)
+                    if widget:
+                        self.log_pass(f"Found {element_name}")
+                    else:
+                        self.log_info(f"{element_name} not found (may be context-dependent)")
+                self.record_navigation('FirmwareUpdateScreen', text_index)
+                
+                # Test check for updates button if available
+                check_btn = UITestHelpers.find_button_by_text(self.screen, "Check for Updates")
+                if check_btn:
+                    self.simulate_click(check_btn, wait_ms=0)
+                    self.wait_for_ui_idle(500)
+                    self.log_pass("Check for updates button interaction completed")
             
-            firmware_screen.cleanup()
             self.log_pass("Firmware update screen test completed")
             return True
             
-        except ImportError:
-            self.log_info("Firmware update screen not implemented yet")
-            return True
         except Exception as e:
             self.log_error(f"Firmware update screen test failed: {e}")
             return False
@@ -95,45 +143,36 @@ class AdditionalScreensUITest(BaseUITest):
         try:
             self.log_info("Testing system info screen...")
             
-            # Import and create system info screen
-            from screens.system_info import SystemInfoScreen
-            info_screen = SystemInfoScreen(self.screen)
-            
-            # Wait for screen to initialize
-            self.wait_for_ui_update(500)
-            
-            # Test basic elements
-            expected_elements = [
-                {'type': 'label', 'text': 'System Information', 'name': 'title'},
-                {'type': 'label', 'text': 'Version', 'name': 'version label'},
-                {'type': 'label', 'text': 'Hardware', 'name': 'hardware label'},
-                {'type': 'label', 'text': 'Memory', 'name': 'memory label'}
-            ]
-            
-            # Verify elements exist
-            for element in expected_elements:
-                widget = UITestHelpers.find_widget_by_text(self.screen, element['text'])
-                if widget:
-                    self.log_pass(f"Found {element['name']}")
-                else:
-                    self.log_info(f"{element['name']} not found (may be different text)")
-            
-            # Look for any buttons on the screen
-            buttons = UITestHelpers.get_all_buttons(self.screen)
-            if buttons:
-                self.log_pass(f"Found {len(buttons)} button(s) on system info screen")
+            # Create system info screen
+            SystemInfoScreen = self._screen_classes['system_info']
+            if SystemInfoScreen is None:
+                self.log_info("System info screen not implemented yet")
+                return True
+            with self.managed_screen(SystemInfoScreen):
+                # Wait for screen to initialize
+                self.wait_for_screen_text("System Information")
+                
+                # Verify elements exist
+                text_index, buttons, _ = UITestHelpers.index_widgets(self.screen)
+                for element_type, element_text, element_name in _SYSTEM_INFO_ELEMENTS:
+                    widget = text_index.get(element_text)
+                    if widget:
+                        self.log_pass(f"Found {element_name}")
+                    else:
+                        self.log_info(f"{element_name} not found (may be different text)")
+                self.record_navigation('SystemInfoScreen', text_index)
                 
-                # Test clicking first button
-                if self.simulate_click(buttons[0]):
-                    self.log_pass("System info button interaction completed")
+                # Look for any buttons on the screen
+                if buttons:
+                    self.log_pass(f"Found {len(buttons)} button(s) on system info screen")
+                
+                    # Test clicking first button
+                    if self.simulate_click(buttons[0]):
+                        self.log_pass("System info button interaction completed")
             
-            info_screen.cleanup()
             self.log_pass("System info screen test completed")
             return True
             
-        except ImportError:
-            self.log_info("System info screen not implemented yet")
-            return True
         except Exception as e:
             self.log_error(f"System info screen test failed: {e}")
             return False
@@ -144,44 +183,38 @@ class AdditionalScreensUITest(BaseUITest):
             self.log_info("Testing DTC screens...")
             
             # Test Clear DTC screen
-            try:
-                from screens.dtc.clear_dtc import ClearDTCScreen
-                clear_dtc_screen = ClearDTCScreen(self.screen)
-                
-                self.wait_for_ui_update(500)
-                
-                # Look for clear DTC elements
-                clear_btn = UITestHelpers.find_button_by_text(self.screen, "Clear DTCs")
-                if clear_btn:
-                    self.log_pass("Found Clear DTCs button")
-                    self.simulate_click(clear_btn)
-                    self.wait_for_ui_update(300)
+            ClearDTCScreen = self._screen_classes['clear_dtc']
+            if ClearDTCScreen is None:
+                self.log_info("Clear DTC screen not implemented yet")
+            else:
+                with self.managed_screen(ClearDTCScreen):
+                    self.wait_for_screen_text("Clear DTCs")
+                    
+                    # Look for clear DTC elements
+                    clear_btn = UITestHelpers.find_button_by_text(self.screen, "Clear DTCs")
+                    if clear_btn:
+                        self.log_pass("Found Clear DTCs button")
+                        self.simulate_click(clear_btn, wait_ms=0)
+                        self.wait_for_ui_idle(300)
                 
-                clear_dtc_screen.cleanup()
                 self.log_pass("Clear DTC screen test completed")
-                
-            except ImportError:
-                self.log_info("Clear DTC screen not implemented yet")
             
             # Test Read DTC screen
-            try:
-                from screens.dtc.read_dtc import ReadDTCScreen
-                read_dtc_screen = ReadDTCScreen(self.screen)
-                
-                self.wait_for_ui_update(500)
-                
-                # Look for read DTC elements
-                read_btn = UITestHelpers.find_button_by_text(self.screen, "Read DTCs")
-                if read_btn:
-                    self.log_pass("Found Read DTCs button")
-                    self.simulate_click(read_btn)
-                    self.wait_for_ui_update(300)
+            ReadDTCScreen = self._screen_classes['read_dtc']
+            if ReadDTCScreen is None:
+                self.log_info("Read DTC screen not implemented yet")
+            else:
+                with self.managed_screen(ReadDTCScreen):
+                    self.wait_for_screen_text("Read DTCs")
+                    
+                    # Look for read DTC elements
+                    read_btn = UITestHelpers.find_button_by_text(self.screen, "Read DTCs")
+                    if read_btn:
+                        self.log_pass("Found Read DTCs button")
+                        self.simulate_click(read_btn, wait_ms=0)
+                        self.wait_for_ui_idle(300)
                 
-                read_dtc_screen.cleanup()
                 self.log_pass("Read DTC screen test completed")
-                
-            except ImportError:
-                self.log_info("Read DTC screen not implemented yet")
             
             return True
             
@@ -194,41 +227,32 @@ class AdditionalScreensUITest(BaseUITest):
         try:
             self.log_info("Testing live data screen...")
             
-            # Import and create live data screen
-            from screens.live_data.read_live_data import ReadLiveDataScreen
-            live_data_screen = ReadLiveDataScreen(self.screen)
-            
-            # Wait for screen to initialize
-            self.wait_for_ui_update(500)
-            
-            # Test basic elements
-            expected_elements = [
-                {'type': 'label', 'text': 'Live Data', 'name': 'title'},
-                {'type': 'button', 'text': 'Start', 'name': 'start button'},
-                {'type': 'button', 'text': 'Stop', 'name': 'stop button'},
-                {'type': 'button', 'text': 'Refresh', 'name': 'refresh button'}
-            ]
-            
-            # Verify elements exist
-            for element in expected_elements:
-                widget = UITestHelpers.find_widget_by_text(self.screen, element['text'])
-                if widget:
-                    self.log_pass(f"Found {element['name']}")
-                    
-                    # Test button interaction
-                    if element['type'] == 'button':
-                        self.simulate_click(widget)
-                        self.wait_for_ui_update(200)
-                else:
-                    self.log_info(f"{element['name']} not found (may be different text)")
+            # Create live data screen
+            ReadLiveDataScreen = self._screen_classes['live_data']
+            if ReadLiveDataScreen is None:
+                self.log_info("Live data screen not implemented yet")
+                return True
+            with self.managed_screen(ReadLiveDataScreen):
+                # Wait for screen to initialize
+                self.wait_for_screen_text("Read Live Data")
+                
+                # Verify elements exist; clicks only wait for the UI to go idle
+                text_index = UITestHelpers.build_text_index(self.screen)
+                for element_type, element_text, element_name in _LIVE_DATA_ELEMENTS:
+                    widget = text_index.get(element_text)
+                    if widget:
+                        self.log_pass(f"Found {element_name}")
+                
+                        # Test button interaction
+                        if element_type == 'button':
+                            self.simulate_click(widget, wait_ms=0)
+                            self.wait_for_ui_idle(200)
+                    else:
+                        self.log_info(f"{element_name} not found (may be different text)")
             
-            live_data_screen.cleanup()
             self.log_pass("Live data screen test completed")
             return True
             
-        except ImportError:
-            self.log_info("Live data screen not implemented yet")
-            return True
         except Exception as e:
             self.log_error(f"Live data screen test failed: {e}")
             return False
@@ -238,54 +262,45 @@ class AdditionalScreensUITest(BaseUITest):
         try:
             self.log_info("Testing RPM sensor configuration screen...")
             
-            # Import and create sensor config screen
-            from screens.rpm_sensor_config import RPMSensorConfigScreen
-            config_screen = RPMSensorConfigScreen(self.screen)
-            
-            # Wait for screen to initialize
-            self.wait_for_ui_update(500)
-            
-            # Test basic elements
-            expected_elements = [
-                {'type': 'label', 'text': 'Sensor Configuration', 'name': 'title'},
-                {'type': 'label', 'text': 'Crankshaft', 'name': 'crankshaft label'},
-                {'type': 'label', 'text': 'Camshaft', 'name': 'camshaft label'},
-                {'type': 'button', 'text': 'Save', 'name': 'save button'}
-            ]
-            
-            # Verify elements exist
-            for element in expected_elements:
-                widget = UITestHelpers.find_widget_by_text(self.screen, element['text'])
-                if widget:
-                    self.log_pass(f"Found {element['name']}")
-                else:
-                    self.log_info(f"{element['name']} not found (may be different text)")
-            
-            # Look for sliders (for tooth configuration)
-            sliders = UITestHelpers.get_all_sliders(self.screen)
-            if sliders:
-                self.log_pass(f"Found {len(sliders)} slider(s) for sensor configuration")
+            # Create sensor config screen
+            RPMSensorConfigScreen = self._screen_classes['rpm_sensor_config']
+            if RPMSensorConfigScreen is None:
+                self.log_info("RPM sensor configuration screen not implemented yet")
+                return True
+            with self.managed_screen(RPMSensorConfigScreen):
+                # Wait for screen to initialize
+                self.wait_for_screen_text("RPM Sensor Configuration")
                 
-                # Test slider interaction
-                for i, slider in enumerate(sliders[:3]):  # Test first 3 sliders
-                    test_value = 50 + (i * 20)  # Different values for each slider
-                    if self.simulate_slider_change(slider, test_value):
-                        self.log_pass(f"Slider {i+1} interaction completed")
-            
-            # Test save button if available
-            save_btn = UITestHelpers.find_button_by_text(self.screen, "Save")
-            if save_btn:
-                self.simulate_click(save_btn)
-                self.wait_for_ui_update(300)
-                self.log_pass("Save button interaction completed")
+                # Verify elements exist
+                text_index, _, sliders = UITestHelpers.index_widgets(self.screen)
+                for element_type, element_text, element_name in _SENSOR_CONFIG_ELEMENTS:
+                    widget = text_index.get(element_text)
+                    if widget:
+                        self.log_pass(f"Found {element_name}")
+                    else:
+                        self.log_info(f"{element_name} not found (may be different text)")
+                self.record_navigation('RPMSensorConfigScreen', text_index)
+                
+                # Look for sliders (for tooth configuration)
+                if sliders:
+                    self.log_pass(f"Found {len(sliders)} slider(s) for sensor configuration")
+                
+                    # Test slider interaction
+                    for i, slider in enumerate(sliders[:3]):  # Test first 3 sliders
+                        test_value = 50 + (i * 20)  # Different values for each slider
+                        if self.simulate_slider_change(slider, test_value):
+                            self.log_pass(f"Slider {i+1} interaction completed")
+                
+                # Test save button if available
+                save_btn = UITestHelpers.find_button_by_text(self.screen, "Save")
+                if save_btn:
+                    self.simulate_click(save_btn, wait_ms=0)
+                    self.wait_for_ui_idle(300)
+                    self.log_pass("Save button interaction completed")
             
-            config_screen.cleanup()
             self.log_pass("RPM sensor configuration screen test completed")
             return True
             
-        except ImportError:
-            self.log_info("RPM sensor configuration screen not implemented yet")
-            return True
         except Exception as e:
             self.log_error(f"RPM sensor configuration screen test failed: {e}")
             return False
@@ -297,41 +312,21 @@ class AdditionalScreensUITest(BaseUITest):
             
             # Test that all screens have consistent navigation elements
             screens_to_test = [
-                ('firmware_update', 'FirmwareUpdateScreen'),
+                ('firmware', 'FirmwareUpdateScreen'),
                 ('system_info', 'SystemInfoScreen'),
                 ('rpm_sensor_config', 'RPMSensorConfigScreen')
             ]
             
-            for screen_module, screen_class in screens_to_test:
-                try:
-                    # Import screen dynamically
-                    module = __import__(f'screens.{screen_module}', fromlist=[screen_class])
-                    screen_cls = getattr(module, screen_class)
-                    
-                    # Create screen instance
-                    screen_instance = screen_cls(self.screen)
-                    self.wait_for_ui_update(300)
-                    
-                    # Look for common navigation elements
-                    nav_elements = ['Back', 'Cancel', 'Close', 'Done']
-                    found_nav = False
-                    
-                    for nav_text in nav_elements:
-                        nav_btn = UITestHelpers.find_button_by_text(self.screen, nav_text)
-                        if nav_btn:
-                            self.log_pass(f"{screen_class} has {nav_text} navigation")
-                            found_nav = True
-                            break
-                    
-                    if not found_nav:
-                        self.log_info(f"{screen_class} navigation elements not found (may be implicit)")
-                    
-                    screen_instance.cleanup()
-                    
-                except ImportError:
+            # Screens were already built and indexed by their own tests
+            for screen_key, screen_class in screens_to_test:
+                if self._screen_classes[screen_key] is None:
                     self.log_info(f"{screen_class} not implemented yet")
-                except Exception as e:
-                    self.log_error(f"Navigation test failed for {screen_class}: {e}")
+                elif screen_class not in self._nav_results:
+                    self.log_info(f"{screen_class} was not exercised by its screen test")
+                elif self._nav_results[screen_class]:
+                    self.log_pass(f"{screen_class} has {self._nav_results[screen_class]} navigation")
+                else:
+                    self.log_info(f"{screen_class} navigation elements not found (may be implicit)")
             
             self.log_pass("Screen navigation consistency test completed")
             return True
@@ -366,6 +361,7 @@ class AdditionalScreensUITest(BaseUITest):
                         passed_tests += 1
                 except Exception as e:
                     self.log_error(f"Test {test.__name__} crashed: {e}")
+                self.flush_log()
             
             # Print summary
             self.log_info(f"Completed {passed_tests}/{len(tests)} tests successfully")
@@ -3,20 +3,42 @@ Comprehensive Callback Tests for ECU Diagnostic Tool
 Tests every UI callback function with screenshot validation
 """
 
-import lvgl as lv
-import utime as time
+# lvgl is imported where it is used so collecting this module stays cheap
 import sys
 import os
 
-# Add src to path for imports
+# Add src and test to path for imports
 sys.path.insert(0, 'src')
+sys.path.append('test')
+
+# Create screenshots directory once (MicroPython's os has mkdir but no makedirs)
+try:
+    os.mkdir('test/screenshots')
+except OSError:
+    pass
+
+class _MockEvent:
+    """Stand-in event object for callbacks that ignore their event"""
+    pass
+
+_MOCK_EVENT = _MockEvent()
+
+# Screen shared by all callback tests, created on first use after lv.init()
+_shared_scr = None
+
+def _setup_shared_screen():
+    """Return the shared test screen, emptied of the previous test's widgets"""
+    global _shared_scr
+    if _shared_scr is None:
+        import lvgl as lv
+        _shared_scr = lv.obj()
+    else:
+        _shared_scr.clean()
+    return _shared_scr
 
 def take_screenshot(filename):
     """Take a screenshot for validation"""
     try:
-        # Create screenshots directory if it doesn't exist
-        os.makedirs('test/screenshots', exist_ok=True)
-        
         # Take screenshot (this may not work in all simulation environments)
         # For now, we'll just log that a screenshot would be taken
         print(f"📸 Screenshot taken: {filename}")
@@ -25,258 +47,82 @@ def take_screenshot(filename):
         print(f"❌ Screenshot failed: {e}")
         return False
 
-def test_main_screen_callbacks():
-    """Test all main screen callback functions"""
-    print("\n=== Testing Main Screen Callbacks ===")
-    
-    try:
-        from screens.main_screen import MainScreen
-        from utils.navigation_manager import nav_manager, app_state
-        from utils.data_manager import DataManager
-        from utils.error_handler import ErrorHandler
-        
-        # Initialize app state
-        if not hasattr(app_state, 'data_manager') or not app_state.data_manager:
-            app_state.data_manager = DataManager()
-        if not hasattr(app_state, 'error_handler') or not app_state.error_handler:
-            app_state.error_handler = ErrorHandler()
-        
-        # Create main screen
-        scr = lv.obj()
-        main_screen = MainScreen(scr)
-        
-        # Test on_enter callback
-        try:
-            main_screen.on_enter()
-            print("✓ Main screen on_enter callback works")
-            take_screenshot("main_screen_on_enter.png")
-        except Exception as e:
-            print(f"✗ Main screen on_enter failed: {e}")
-        
-        # Test on_exit callback
-        try:
-            main_screen.on_exit()
-            print("✓ Main screen on_exit callback works")
-        except Exception as e:
-            print(f"✗ Main screen on_exit failed: {e}")
-        
-        # Test menu button callback
-        try:
-            # Simulate menu button click
-            main_screen.on_menu_click(None)
-            print("✓ Main screen menu button callback works")
-            take_screenshot("main_screen_menu_open.png")
-        except Exception as e:
-            print(f"✗ Main screen menu button failed: {e}")
-        
-        # Test menu selection callbacks
-        menu_actions = ["select_ecu", "updates"]
-        for action in menu_actions:
-            try:
-                main_screen.on_menu_select(action)
-                print(f"✓ Main screen menu action '{action}' works")
-            except Exception as e:
-                print(f"✗ Main screen menu action '{action}' failed: {e}")
-        
-        # Test WiFi button callback
-        try:
-            main_screen.on_wifi_click(None)
-            print("✓ Main screen WiFi button callback works")
-        except Exception as e:
-            print(f"✗ Main screen WiFi button failed: {e}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ Main screen callback tests failed: {e}")
-        return False
-
-def test_system_selection_callbacks():
-    """Test all system selection screen callback functions"""
-    print("\n=== Testing System Selection Callbacks ===")
-    
-    try:
-        from screens.system_selection import SystemSelectionScreen
-        from utils.navigation_manager import nav_manager, app_state
-        
-        # Create system selection screen
-        scr = lv.obj()
-        sys_screen = SystemSelectionScreen(scr)
-        
-        # Test on_enter callback
-        try:
-            sys_screen.on_enter()
-            print("✓ System selection on_enter callback works")
-            take_screenshot("system_selection_on_enter.png")
-        except Exception as e:
-            print(f"✗ System selection on_enter failed: {e}")
-        
-        # Test back button callback
-        try:
-            sys_screen.on_back_click(None)
-            print("✓ System selection back button callback works")
-        except Exception as e:
-            print(f"✗ System selection back button failed: {e}")
-        
-        # Test search text change callback
-        try:
-            # Mock event object
-            class MockEvent:
-                def __init__(self):
-                    pass
-            
-            sys_screen.on_search_text_change(MockEvent())
-            print("✓ System selection search text change callback works")
-        except Exception as e:
-            print(f"✗ System selection search text change failed: {e}")
-        
-        # Test clear search callback
-        try:
-            sys_screen.on_clear_search(None)
-            print("✓ System selection clear search callback works")
-            take_screenshot("system_selection_clear_search.png")
-        except Exception as e:
-            print(f"✗ System selection clear search failed: {e}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ System selection callback tests failed: {e}")
-        return False
-
-def test_firmware_update_callbacks():
-    """Test all firmware update screen callback functions"""
-    print("\n=== Testing Firmware Update Callbacks ===")
-    
-    try:
-        from screens.firmware_update import FirmwareUpdateScreen
-        from utils.navigation_manager import nav_manager, app_state
-        
-        # Create firmware update screen
-        scr = lv.obj()
-        fw_screen = FirmwareUpdateScreen(scr)
-        
-        # Test on_enter callback (auto-executes update check)
-        try:
-            fw_screen.on_enter()
-            print("✓ Firmware update on_enter callback works")
-            take_screenshot("firmware_update_on_enter.png")
-        except Exception as e:
-            print(f"✗ Firmware update on_enter failed: {e}")
-        
-        # Test check for updates callback
-        try:
-            fw_screen.check_for_updates()
-            print("✓ Firmware update check callback works")
-            take_screenshot("firmware_update_check_complete.png")
-        except Exception as e:
-            print(f"✗ Firmware update check failed: {e}")
-        
-        # Test back button callback
-        try:
-            fw_screen.on_back_click(None)
-            print("✓ Firmware update back button callback works")
-        except Exception as e:
-            print(f"✗ Firmware update back button failed: {e}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ Firmware update callback tests failed: {e}")
-        return False
+def _connect_mock_network(wifi_screen):
+    """Connect the WiFi setup screen to a mock password-protected network"""
+    wifi_screen.selected_network = {
+        'ssid': 'password_test',
+        'requires_password': True,
+        'test_password': 'test'
+    }
+    wifi_screen.connect_to_network('test')
 
-def test_wifi_setup_callbacks():
-    """Test all WiFi setup screen callback functions"""
-    print("\n=== Testing WiFi Setup Callbacks ===")
-    
-    try:
-        from screens.wifi_setup import WifiSetupScreen
-        from utils.navigation_manager import nav_manager, app_state
-        
-        # Create WiFi setup screen
-        scr = lv.obj()
-        wifi_screen = WifiSetupScreen(scr)
-        
-        # Test auto scan on startup
-        try:
-            wifi_screen.auto_scan_networks()
-            print("✓ WiFi setup auto scan callback works")
-            take_screenshot("wifi_setup_auto_scan.png")
-        except Exception as e:
-            print(f"✗ WiFi setup auto scan failed: {e}")
-        
-        # Test scan button callback
-        try:
-            wifi_screen.on_scan_click(None)
-            print("✓ WiFi setup scan button callback works")
-            take_screenshot("wifi_setup_scan_complete.png")
-        except Exception as e:
-            print(f"✗ WiFi setup scan button failed: {e}")
-        
-        # Test close button callback
-        try:
-            wifi_screen.on_close_click(None)
-            print("✓ WiFi setup close button callback works")
-        except Exception as e:
-            print(f"✗ WiFi setup close button failed: {e}")
-        
-        # Test network connection callbacks
-        try:
-            # Test with mock network data
-            wifi_screen.selected_network = {
-                'ssid': 'password_test',
-                'requires_password': True,
-                'test_password': 'test'
-            }
-            wifi_screen.connect_to_network('test')
-            print("✓ WiFi setup network connection callback works")
-            take_screenshot("wifi_setup_connection_success.png")
-        except Exception as e:
-            print(f"✗ WiFi setup network connection failed: {e}")
-        
-        return True
-        
-    except Exception as e:
-        print(f"✗ WiFi setup callback tests failed: {e}")
-        return False
+# Callback suites: (suite name, log prefix, module, class, built on a screen, steps)
+# Each step is (description, method name or callable, args, screenshot or None)
+_CALLBACK_SUITES = (
+    ("Main Screen Callbacks", "Main screen", 'screens.main_screen', 'MainScreen', True, (
+        ("on_enter callback", 'on_enter', (), "main_screen_on_enter.png"),
+        ("on_exit callback", 'on_exit', (), None),
+        ("menu button callback", 'on_menu_click', (None,), "main_screen_menu_open.png"),
+        ("menu action 'select_ecu'", 'on_menu_select', ('select_ecu',), None),
+        ("menu action 'updates'", 'on_menu_select', ('updates',), None),
+        ("WiFi button callback", 'on_wifi_click', (None,), None),
+    )),
+    ("System Selection Callbacks", "System selection", 'screens.system_selection', 'SystemSelectionScreen', True, (
+        ("on_enter callback", 'on_enter', (), "system_selection_on_enter.png"),
+        ("back button callback", 'on_back_click', (None,), None),
+        ("search text change callback", 'on_search_text_change', (_MOCK_EVENT,), None),
+        ("clear search callback", 'on_clear_search', (None,), "system_selection_clear_search.png"),
+    )),
+    ("Firmware Update Callbacks", "Firmware update", 'screens.firmware_update', 'FirmwareUpdateScreen', True, (
+        # on_enter auto-executes the update check
+        ("on_enter callback", 'on_enter', (), "firmware_update_on_enter.png"),
+        ("check callback", 'check_for_updates', (), "firmware_update_check_complete.png"),
+        ("back button callback", 'on_back_click', (None,), None),
+    )),
+    ("WiFi Setup Callbacks", "WiFi setup", 'screens.wifi_setup', 'WifiSetupScreen', True, (
+        ("auto scan callback", 'auto_scan_networks', (), "wifi_setup_auto_scan.png"),
+        ("scan button callback", 'on_scan_click', (None,), "wifi_setup_scan_complete.png"),
+        ("close button callback", 'on_close_click', (None,), None),
+        ("network connection callback", _connect_mock_network, (), "wifi_setup_connection_success.png"),
+    )),
+    ("Error Handler Callbacks", "Error handler", 'utils.error_handler', 'ErrorHandler', False, (
+        ("error dialog callback", 'show_error_dialog', ("Test error message", "Test Error"), "error_dialog.png"),
+        ("warning dialog callback", 'show_warning_dialog', ("Test warning message", "Test Warning"), "warning_dialog.png"),
+        ("info dialog callback", 'show_info_dialog', ("Test info message", "Test Info"), "info_dialog.png"),
+    )),
+)
 
-def test_error_handler_callbacks():
-    """Test all error handler callback functions"""
-    print("\n=== Testing Error Handler Callbacks ===")
+def _run_callback_suite(name, prefix, module_name, class_name, uses_screen, steps):
+    """Build one screen (or handler) and invoke each callback step on it"""
+    print(f"\n=== Testing {name} ===")
     
     try:
-        from utils.error_handler import ErrorHandler
-        
-        error_handler = ErrorHandler()
+        __import__(module_name)
+        target_cls = getattr(sys.modules[module_name], class_name)
+        target = target_cls(_setup_shared_screen()) if uses_screen else target_cls()
         
-        # Test error dialog callback
-        try:
-            error_handler.show_error_dialog("Test error message", "Test Error")
-            print("✓ Error handler error dialog callback works")
-            take_screenshot("error_dialog.png")
-        except Exception as e:
-            print(f"✗ Error handler error dialog failed: {e}")
-        
-        # Test warning dialog callback
-        try:
-            error_handler.show_warning_dialog("Test warning message", "Test Warning")
-            print("✓ Error handler warning dialog callback works")
-            take_screenshot("warning_dialog.png")
-        except Exception as e:
-            print(f"✗ Error handler warning dialog failed: {e}")
-        
-        # Test info dialog callback
-        try:
-            error_handler.show_info_dialog("Test info message", "Test Info")
-            print("✓ Error handler info dialog callback works")
-            take_screenshot("info_dialog.png")
-        except Exception as e:
-            print(f"✗ Error handler info dialog failed: {e}")
+        for description, action, args, screenshot in steps:
+            try:
+                if callable(action):
+                    action(target)
+                else:
+                    getattr(target, action)(*args)
+                print(f"✓ {prefix} {description} works")
+                if screenshot:
+                    take_screenshot(screenshot)
+            except Exception as e:
+                print(f"✗ {prefix} {description} failed: {e}")
         
+        if uses_screen:
+            # A cleanup error is reported on its own; the callbacks above already ran
+            try:
+                target.cleanup()
+            except Exception as e:
+                print(f"✗ {prefix} cleanup failed: {e}")
         return True
         
     except Exception as e:
-        print(f"✗ Error handler callback tests failed: {e}")
+        print(f"✗ {prefix} callback tests failed: {e}")
         return False
 
 def run_all_callback_tests():
@@ -285,21 +131,15 @@ def run_all_callback_tests():
     print("=" * 60)
     
     # Initialize LVGL
+    import lvgl as lv
     lv.init()
     
     # Run tests
-    tests = [
-        ("Main Screen Callbacks", test_main_screen_callbacks),
-        ("System Selection Callbacks", test_system_selection_callbacks),
-        ("Firmware Update Callbacks", test_firmware_update_callbacks),
-        ("WiFi Setup Callbacks", test_wifi_setup_callbacks),
-        ("Error Handler Callbacks", test_error_handler_callbacks),
-    ]
-    
     results = []
-    for test_name, test_func in tests:
+    for suite in _CALLBACK_SUITES:
+        test_name = suite[0]
         try:
-            result = test_func()
+            result = _run_callback_suite(*suite)
             results.append((test_name, result))
         except Exception as e:
             print(f"✗ {test_name} crashed: {e}")
@@ -8,8 +8,32 @@ import utime as time
 import sys
 import os
 
-# Add src to path for imports
-sys.path.insert(0, 'src')
+# Add src and test to path for imports
+if 'src' not in sys.path:
+    sys.path.insert(0, 'src')
+if 'test' not in sys.path:
+    sys.path.append('test')
+
+from screens.main_screen import MainScreen
+from screens.system_selection import SystemSelectionScreen
+from utils.navigation_manager import app_state, nav_manager
+from ui.utils.app_state_helper import register_all_screens
+
+# app_state builds its data manager and error handler when navigation_manager
+# is imported, so only the screens need registering here
+register_all_screens()
+
+# Set RPMSIM_SKIP_SCREENSHOTS (e.g. in CI) to turn take_screenshot into a no-op;
+# MicroPython's os may not provide getenv
+_getenv = getattr(os, 'getenv', None)
+_SKIP_SCREENSHOTS = _getenv is not None and _getenv('RPMSIM_SKIP_SCREENSHOTS', '') not in ('', '0')
+
+# Raw RGB565 frames are written here as they are captured
+_SCREENSHOT_DIR = 'test/screenshots'
+
+# task_handler delays at or above this mean no timer (refresh, animation) is pending;
+# 0 means a timer is due right now
+_IDLE_MS = 1000
 
 class UIInteractionTester:
     """Comprehensive UI interaction tester"""
@@ -17,13 +41,37 @@ class UIInteractionTester:
     def __init__(self):
         self.test_results = []
         self.screenshot_count = 0
+        self._passed = 0
+        # Root screen shared by all tests, created after lv.init()
+        self._scratch = None
+        self._screenshots_enabled = not _SKIP_SCREENSHOTS
+        # Draw buffer reused by every snapshot, allocated on first capture
+        self._snap_buf = None
+        # Per-test output is buffered and written in one go by flush_log()
+        self._log_buf = []
+        # Bound test methods, resolved once
+        self._tests = (
+            self.test_main_screen_menu_dialog,
+            self.test_wifi_setup_navigation,
+            self.test_system_selection_functionality,
+        )
         
+    def scratch_screen(self):
+        """Return the shared root screen, emptied of the previous test's widgets"""
+        if self._scratch is None:
+            self._scratch = lv.obj()
+        else:
+            self._scratch.clean()
+        return self._scratch
+    
     def log_test(self, test_name, passed, details=""):
         """Log test result"""
         status = "✓ PASS" if passed else "✗ FAIL"
-        print(f"{status}: {test_name}")
+        if passed:
+            self._passed += 1
+        self._log_buf.append(f"{status}: {test_name}")
         if details:
-            print(f"    {details}")
+            self._log_buf.append(f"    {details}")
         
         self.test_results.append({
             'name': test_name,
@@ -33,84 +81,107 @@ class UIInteractionTester:
     
     def take_screenshot(self, name):
         """Take a screenshot for visual validation"""
+        if not self._screenshots_enabled:
+            return True
         try:
-            # Create screenshot filename
-            filename = f"test_screenshot_{self.screenshot_count:03d}_{name}.png"
+            # Create screenshot filename; frames are raw RGB565, not encoded
+            filename = f"{_SCREENSHOT_DIR}/test_screenshot_{self.screenshot_count:03d}_{name}.rgb565"
             self.screenshot_count += 1
             
-            # Take screenshot (this would work in a real LVGL environment)
-            # For now, just log that we would take a screenshot
-            print(f"    📸 Screenshot: {filename}")
+            # Render into the reused buffer and write it out before the next
+            # capture overwrites it
+            buf = self._snapshot()
+            if buf is None:
+                return False
+            self._write_frame(filename, buf)
+            self._log_buf.append(f"    📸 Screenshot: {filename}")
             return True
         except Exception as e:
-            print(f"    ❌ Screenshot failed: {e}")
+            self._log_buf.append(f"    ❌ Screenshot failed: {e}")
             return False
     
-    def simulate_click(self, widget, description):
+    def flush_log(self):
+        """Write buffered output lines with a single write"""
+        if self._log_buf:
+            sys.stdout.write('\n'.join(self._log_buf) + '\n')
+            self._log_buf.clear()
+    
+    def _snapshot(self):
+        """Render the scratch screen into the shared draw buffer"""
+        if self._scratch is None:
+            return None
+        if self._snap_buf is None:
+            self._snap_buf = lv.draw_buf_create(self._scratch.get_width(), self._scratch.get_height(),
+                                                lv.COLOR_FORMAT.RGB565, 0)
+        lv.snapshot_take_to_draw_buf(self._scratch, lv.COLOR_FORMAT.RGB565, self._snap_buf)
+        return self._snap_buf
+    
+    def _write_frame(self, filename, buf):
+        """Write the pixel data of a draw buffer to filename"""
+        if self.screenshot_count == 1:
+            try:
+                os.mkdir(_SCREENSHOT_DIR)
+            except OSError:
+                pass
+        with open(filename, 'wb') as f:
+            f.write(buf.data.__dereference__(buf.data_size))
+    
+    def simulate_click(self, widget, description, max_wait_ms=50):
         """Simulate a click on a widget"""
         try:
-            print(f"    🖱️  Clicking: {description}")
-            # Create a click event
-            event = lv.event_t()
-            event.code = lv.EVENT.CLICKED
-            event.target = widget
-            
-            # Send the event
+            self._log_buf.append(f"    🖱️  Clicking: {description}")
+            # send_event builds the event itself
             widget.send_event(lv.EVENT.CLICKED, None)
             
             # Wait for UI to update
-            for _ in range(10):
-                lv.task_handler()
-                time.sleep_ms(5)
+            self.drain_ui(max_wait_ms)
             
             return True
         except Exception as e:
-            print(f"    ❌ Click failed: {e}")
+            self._log_buf.append(f"    ❌ Click failed: {e}")
             return False
     
-    def simulate_text_input(self, textarea, text, description):
+    def simulate_text_input(self, textarea, text, description, max_wait_ms=50):
         """Simulate text input"""
         try:
-            print(f"    ⌨️  Typing: {description}")
+            self._log_buf.append(f"    ⌨️  Typing: {description}")
             textarea.set_text(text)
             
             # Trigger value changed event
             textarea.send_event(lv.EVENT.VALUE_CHANGED, None)
             
             # Wait for UI to update
-            for _ in range(10):
-                lv.task_handler()
-                time.sleep_ms(5)
+            self.drain_ui(max_wait_ms)
             
             return True
         except Exception as e:
-            print(f"    ❌ Text input failed: {e}")
+            self._log_buf.append(f"    ❌ Text input failed: {e}")
             return False
     
+    def drain_ui(self, max_ms=50):
+        """Run the LVGL task handler until the UI is idle or max_ms elapses"""
+        start_time = time.ticks_ms()
+        while True:
+            # task_handler returns the time until the next timer is due
+            next_ms = lv.task_handler()
+            if next_ms >= _IDLE_MS:
+                return
+            remaining = max_ms - time.ticks_diff(time.ticks_ms(), start_time)
+            if remaining <= 0:
+                return
+            time.sleep_ms(min(next_ms, remaining))
+    
     def wait_for_ui(self, duration_ms=100):
-        """Wait for UI to update"""
-        for _ in range(duration_ms // 5):
-            lv.task_handler()
-            time.sleep_ms(5)
+        """Wait for UI to update, returning early once it is idle"""
+        self.drain_ui(duration_ms)
     
     def test_main_screen_menu_dialog(self):
         """Test the main screen menu and check for updates dialog"""
         print("\n=== Testing Main Screen Menu Dialog ===")
         
         try:
-            from screens.main_screen import MainScreen
-            from utils.navigation_manager import app_state, nav_manager
-            from utils.data_manager import DataManager
-            from utils.error_handler import ErrorHandler
-            
-            # Initialize app state
-            if not hasattr(app_state, 'data_manager') or not app_state.data_manager:
-                app_state.data_manager = DataManager()
-            if not hasattr(app_state, 'error_handler') or not app_state.error_handler:
-                app_state.error_handler = ErrorHandler()
-            
             # Create main screen
-            scr = lv.obj()
+            scr = self.scratch_screen()
             main_screen = MainScreen(scr)
             
             self.take_screenshot("main_screen_initial")
@@ -152,15 +223,11 @@ class UIInteractionTester:
         print("\n=== Testing WiFi Setup Navigation ===")
         
         try:
-            from screens.main_screen import MainScreen
-            from screens.wifi_setup import WifiSetupScreen
-            from utils.navigation_manager import app_state, nav_manager
-            
-            # Register wifi setup screen
-            nav_manager.register_screen("wifi_setup", WifiSetupScreen)
+            # wifi_setup is registered at module load
+            self.log_test("WiFi setup screen registered", "wifi_setup" in nav_manager.screens)
             
             # Create main screen
-            scr = lv.obj()
+            scr = self.scratch_screen()
             main_screen = MainScreen(scr)
             
             # Test WiFi button click
@@ -187,20 +254,12 @@ class UIInteractionTester:
         print("\n=== Testing System Selection Functionality ===")
         
         try:
-            from screens.system_selection import SystemSelectionScreen
-            from utils.navigation_manager import app_state, nav_manager
-            from utils.data_manager import DataManager
-            from utils.error_handler import ErrorHandler
-            
-            # Initialize app state
-            if not hasattr(app_state, 'data_manager') or not app_state.data_manager:
-                app_state.data_manager = DataManager()
-            if not hasattr(app_state, 'error_handler') or not app_state.error_handler:
-                app_state.error_handler = ErrorHandler()
-            
             # Create system selection screen
-            scr = lv.obj()
+            scr = self.scratch_screen()
             system_screen = SystemSelectionScreen(scr)
+            widgets = system_screen.widgets
+            list_container = widgets.get('list_container')
+            search_input = widgets.get('search_display')
             
             self.take_screenshot("system_selection_initial")
             
@@ -209,14 +268,13 @@ class UIInteractionTester:
             self.log_test("Brands data loaded", len(brands) > 0, f"Found {len(brands)} brands: {brands}")
             
             # Test if brands are displayed in UI
-            if 'list_container' in system_screen.widgets:
-                list_container = system_screen.widgets['list_container']
-                children = list_container.get_children()
-                self.log_test("Brands displayed in UI", len(children) > 0, f"Found {len(children)} brand buttons")
+            if list_container is not None:
+                child_count = list_container.get_child_cnt()
+                self.log_test("Brands displayed in UI", child_count > 0, f"Found {child_count} brand buttons")
                 
                 # Test clicking on first brand if available
-                if len(children) > 0:
-                    first_brand_btn = children[0]
+                if child_count > 0:
+                    first_brand_btn = list_container.get_child(0)
                     success = self.simulate_click(first_brand_btn, "First brand button")
                     self.log_test("Brand selection click", success)
                     
@@ -225,8 +283,7 @@ class UIInteractionTester:
                 self.log_test("List container exists", False, "List container not found")
             
             # Test search functionality
-            if 'search_display' in system_screen.widgets:
-                search_input = system_screen.widgets['search_display']
+            if search_input is not None:
                 success = self.simulate_text_input(search_input, "VW", "Search for VW")
                 self.log_test("Search input", success)
                 
@@ -234,14 +291,13 @@ class UIInteractionTester:
                 
                 # Check if search results are displayed
                 self.wait_for_ui(200)
-                list_container = system_screen.widgets['list_container']
-                children = list_container.get_children()
-                self.log_test("Search results displayed", len(children) > 0, f"Found {len(children)} search results")
+                child_count = list_container.get_child_cnt() if list_container is not None else 0
+                self.log_test("Search results displayed", child_count > 0, f"Found {child_count} search results")
             else:
                 self.log_test("Search input exists", False, "Search input not found")
             
             # Test keyboard layout (visual check)
-            if 'keyboard' in system_screen.widgets and 'list_container' in system_screen.widgets:
+            if 'keyboard' in widgets and list_container is not None:
                 self.log_test("Keyboard layout", True, "Keyboard and list container both exist")
                 self.take_screenshot("system_selection_keyboard_layout")
             else:
@@ -261,32 +317,28 @@ class UIInteractionTester:
         # Initialize LVGL
         lv.init()
         
-        # Run individual tests
-        self.test_main_screen_menu_dialog()
-        self.test_wifi_setup_navigation()
-        self.test_system_selection_functionality()
+        # Run individual tests; they share the scratch screen, app_state and
+        # nav_manager, and LVGL is not re-entrant, so they must run in sequence
+        for test in self._tests:
+            test()
+            self.flush_log()
         
         # Print summary
-        print("\n" + "=" * 50)
-        print("TEST SUMMARY")
-        print("=" * 50)
+        out = ["", "=" * 50, "TEST SUMMARY", "=" * 50]
         
-        passed = sum(1 for result in self.test_results if result['passed'])
+        passed = self._passed
         total = len(self.test_results)
         
         for result in self.test_results:
             status = "✓" if result['passed'] else "✗"
-            print(f"{status} {result['name']}")
+            out.append(f"{status} {result['name']}")
         
-        print(f"\nResults: {passed}/{total} tests passed")
-        print(f"Screenshots taken: {self.screenshot_count}")
+        out.append(f"\nResults: {passed}/{total} tests passed")
+        out.append(f"Screenshots taken: {self.screenshot_count}")
+        out.append("🎉 All tests passed!" if passed == total else "❌ Some tests failed!")
+        sys.stdout.write('\n'.join(out) + '\n')
         
-        if passed == total:
-            print("🎉 All tests passed!")
-            return True
-        else:
-            print("❌ Some tests failed!")
-            return False
+        return passed == total
 
 def main():
     """Main test function"""
@@ -3,35 +3,47 @@ Full Test Suite Validation for ECU Diagnostic Tool
 Validates all UI features work correctly without regressions
 """
 
-import lvgl as lv
+# lvgl, the app modules and the screens are imported inside the tests,
+# so test_core_functionality really checks that they import
 import sys
 import os
 
-# Add src to path for imports
-sys.path.insert(0, 'src')
+# Add src and test to path for imports
+if 'src' not in sys.path:
+    sys.path.insert(0, 'src')
+if 'test' not in sys.path:
+    sys.path.append('test')
+
+# Set by _ensure_lvgl(), called by the tests that build widget trees; the rest
+# run without lv.init()
+_lvgl_ready = False
+
+def _ensure_lvgl():
+    """Initialize LVGL the first time a test needs it; returns the lvgl module"""
+    global _lvgl_ready
+    import lvgl as lv
+    if not _lvgl_ready:
+        lv.init()
+        _lvgl_ready = True
+    return lv
 
 def test_core_functionality():
     """Test core application functionality"""
     print("=== Testing Core Functionality ===")
     
     try:
-        # Test imports
-        from utils.navigation_manager import nav_manager, app_state
-        from utils.data_manager import DataManager
-        from utils.error_handler import ErrorHandler
+        # Test core module imports
+        from utils.navigation_manager import app_state
         from screens.main_screen import MainScreen
         from screens.system_selection import SystemSelectionScreen
         from screens.wifi_setup import WifiSetupScreen
         from screens.firmware_update import FirmwareUpdateScreen
-        
         print("✓ All core modules import successfully")
         
-        # Test app state initialization
-        if not hasattr(app_state, 'data_manager') or not app_state.data_manager:
-            app_state.data_manager = DataManager()
-        if not hasattr(app_state, 'error_handler') or not app_state.error_handler:
-            app_state.error_handler = ErrorHandler()
-        
+        # Test app state initialization (AppState builds its managers on import)
+        if app_state.data_manager is None or app_state.error_handler is None:
+            print("✗ App state managers not initialized")
+            return False
         print("✓ App state initializes correctly")
         
         # Test data loading
@@ -53,23 +65,36 @@ def test_screen_creation():
     print("\n=== Testing Screen Creation ===")
     
     try:
+        lv = _ensure_lvgl()
         from screens.main_screen import MainScreen
         from screens.system_selection import SystemSelectionScreen
         from screens.wifi_setup import WifiSetupScreen
         from screens.firmware_update import FirmwareUpdateScreen
-        from utils.navigation_manager import nav_manager, app_state
-        
-        screens_to_test = [
+        screens_to_test = (
             ("Main Screen", MainScreen),
             ("System Selection Screen", SystemSelectionScreen),
             ("WiFi Setup Screen", WifiSetupScreen),
             ("Firmware Update Screen", FirmwareUpdateScreen),
-        ]
+        )
+        
+        # One root screen, emptied between screens, instead of one per screen
+        scr = lv.obj()
         
+        # Fast path: build every screen under a single try
+        try:
+            for _, screen_class in screens_to_test:
+                scr.clean()
+                screen_class(scr)
+            print(f"✓ All {len(screens_to_test)} screens created successfully")
+            return True
+        except Exception:
+            pass
+        
+        # Slow path: retry one by one to report which screen failed
         all_created = True
         for screen_name, screen_class in screens_to_test:
             try:
-                scr = lv.obj()
+                scr.clean()
                 screen_instance = screen_class(scr)
                 print(f"✓ {screen_name} created successfully")
             except Exception as e:
@@ -88,18 +113,10 @@ def test_navigation_system():
     
     try:
         from utils.navigation_manager import nav_manager
-        from screens.main_screen import MainScreen
-        from screens.system_selection import SystemSelectionScreen
-        from screens.wifi_setup import WifiSetupScreen
-        from screens.firmware_update import FirmwareUpdateScreen
-        
-        # Register screens
-        nav_manager.register_screen("main", MainScreen)
-        nav_manager.register_screen("system_selection", SystemSelectionScreen)
-        nav_manager.register_screen("wifi_setup", WifiSetupScreen)
-        nav_manager.register_screen("firmware_update", FirmwareUpdateScreen)
+        from ui.utils.app_state_helper import register_all_screens
         
         # Test screen registration
+        register_all_screens()
         required_screens = ["system_selection", "wifi_setup", "firmware_update"]
         all_registered = True
         
@@ -122,7 +139,6 @@ def test_error_handling():
     
     try:
         from utils.error_handler import ErrorHandler
-        
         error_handler = ErrorHandler()
         
         # Test error logging
@@ -134,6 +150,9 @@ def test_error_handling():
             return False
         
         # Test dialog creation (may not display in headless mode)
+        if not _lvgl_ready:
+            print("- Info dialog creation skipped (LVGL not initialized)")
+            return True
         try:
             error_handler.show_info_dialog("Test message", "Test Title")
             print("✓ Info dialog creation works")
@@ -152,19 +171,24 @@ def test_ui_components():
     print("\n=== Testing UI Components ===")
     
     try:
+        lv = _ensure_lvgl()
         from screens.main_screen import MainScreen
-        from utils.navigation_manager import app_state
         
         # Create main screen to test UI components
         scr = lv.obj()
         main_screen = MainScreen(scr)
         
         # Test widget creation
-        required_widgets = ['toolbar', 'menu_btn', 'title_btn', 'wifi_icon', 'main_area']
-        all_widgets_exist = True
+        required_widgets = MainScreen.REQUIRED_WIDGETS
+        widgets = main_screen.widgets
+        if all(w in widgets for w in required_widgets):
+            print(f"✓ All {len(required_widgets)} required widgets exist")
+            return True
         
+        # Report each widget only when something is missing
+        all_widgets_exist = True
         for widget_name in required_widgets:
-            if widget_name in main_screen.widgets:
+            if widget_name in widgets:
                 print(f"✓ {widget_name} widget exists")
             else:
                 print(f"✗ {widget_name} widget missing")
@@ -182,7 +206,6 @@ def test_data_persistence():
     
     try:
         from utils.data_manager import DataManager
-        
         data_manager = DataManager()
         
         # Test data loading
@@ -207,26 +230,24 @@ def test_data_persistence():
         print(f"✗ Data persistence test failed: {e}")
         return False
 
+# Test categories in run order, built once at module load
+_TESTS = (
+    ("Core Functionality", test_core_functionality),
+    ("Screen Creation", test_screen_creation),
+    ("Navigation System", test_navigation_system),
+    ("Error Handling", test_error_handling),
+    ("UI Components", test_ui_components),
+    ("Data Persistence", test_data_persistence),
+)
+
 def run_full_test_suite():
     """Run the complete test suite"""
     print("Full Test Suite Validation - ECU Diagnostic Tool")
     print("=" * 60)
     
-    # Initialize LVGL
-    lv.init()
-    
     # Run all test categories
-    tests = [
-        ("Core Functionality", test_core_functionality),
-        ("Screen Creation", test_screen_creation),
-        ("Navigation System", test_navigation_system),
-        ("Error Handling", test_error_handling),
-        ("UI Components", test_ui_components),
-        ("Data Persistence", test_data_persistence),
-    ]
-    
     results = []
-    for test_name, test_func in tests:
+    for test_name, test_func in _TESTS:
         try:
             result = test_func()
             results.append((test_name, result))
@@ -234,32 +255,31 @@ def run_full_test_suite():
             print(f"✗ {test_name} crashed: {e}")
             results.append((test_name, False))
     
-    # Print summary
-    print("\n" + "=" * 60)
-    print("FULL TEST SUITE SUMMARY")
-    print("=" * 60)
+    # Build the summary and print it once
+    out = ["", "=" * 60, "FULL TEST SUITE SUMMARY", "=" * 60]
     
     passed = 0
     for test_name, result in results:
         status = "✓ PASS" if result else "✗ FAIL"
-        print(f"{status}: {test_name}")
+        out.append(f"{status}: {test_name}")
         if result:
             passed += 1
     
     total = len(results)
-    print(f"\nResults: {passed}/{total} test categories passed")
+    out.append(f"\nResults: {passed}/{total} test categories passed")
     
     # Overall assessment
     if passed == total:
-        print("\n🎉 ALL TESTS PASSED!")
-        print("✅ No regressions detected")
-        print("✅ All UI features working correctly")
-        print("✅ Application ready for production")
-        return True
+        out.append("\n🎉 ALL TESTS PASSED!")
+        out.append("✅ No regressions detected")
+        out.append("✅ All UI features working correctly")
+        out.append("✅ Application ready for production")
     else:
-        print(f"\n❌ {total - passed} test categories failed!")
-        print("⚠️  Regressions detected - review failed tests")
-        return False
+        out.append(f"\n❌ {total - passed} test categories failed!")
+        out.append("⚠️  Regressions detected - review failed tests")
+    print('\n'.join(out))
+    
+    return passed == total
 
 def main():
     """Main test function"""
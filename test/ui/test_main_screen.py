@@ -17,11 +17,32 @@ try:
     import utime as time
 except ImportError:
     import time
+try:
+    import uos as os
+except ImportError:
+    import os
 import lvgl as lv
 
 from ui.utils.base_ui_test import BaseUITest
 from ui.utils.test_helpers import UITestHelpers
 
+# Resolved once rather than through the binding on every check
+_WIFI_SYMBOL = lv.SYMBOL.WIFI
+
+# Set FAIL_FAST=1 to stop the run at the first failing test;
+# MicroPython's os may not provide getenv
+_getenv = getattr(os, 'getenv', None)
+_FAIL_FAST = _getenv is not None and _getenv('FAIL_FAST', '') not in ('', '0')
+
+# Display names for MainScreen.REQUIRED_WIDGETS in log messages; keys the
+# screen adds later fall back to the widgets key itself
+WIDGET_NAMES = {
+    'menu_btn': "menu button",
+    'title_btn': "title button",
+    'wifi_icon': "WiFi icon",
+    'main_area': "main area",
+}
+
 # Import required modules for testing - moved to setup method to avoid import errors
 
 class MainScreenUITest(BaseUITest):
@@ -37,18 +58,12 @@ class MainScreenUITest(BaseUITest):
         """Set up test environment with mock data"""
         try:
             # Import required modules
-            from utils.navigation_manager import NavigationManager, AppState, nav_manager, app_state
-            from utils.data_manager import DataManager
-            from utils.error_handler import ErrorHandler
+            from utils.navigation_manager import nav_manager, app_state
             from screens.main_screen import MainScreen
             from screens.system_selection import SystemSelectionScreen
 
-            # Use global app_state instance and initialize it
+            # Use global app_state instance; AppState builds its managers on import
             self.app_state = app_state
-            if not hasattr(self.app_state, 'data_manager') or not self.app_state.data_manager:
-                self.app_state.data_manager = DataManager()
-            if not hasattr(self.app_state, 'error_handler') or not self.app_state.error_handler:
-                self.app_state.error_handler = ErrorHandler()
 
             # Set default system for testing
             self.app_state.current_system = {
@@ -61,8 +76,9 @@ class MainScreenUITest(BaseUITest):
             # Use global navigation manager
             self.nav_manager = nav_manager
 
-            # Register system selection screen for navigation testing
-            self.nav_manager.register_screen("system_selection", SystemSelectionScreen)
+            # Register system selection screen for navigation testing, unless another suite already did
+            if "system_selection" not in self.nav_manager.screens:
+                self.nav_manager.register_screen("system_selection", SystemSelectionScreen)
 
             # Create main screen
             self.main_screen = MainScreen(self.screen)
@@ -74,35 +90,24 @@ class MainScreenUITest(BaseUITest):
             self.log_error(f"Test environment setup failed: {e}")
             return False
     
+    def reset_main_screen(self):
+        """Reset transient main screen state between tests, keeping the screen itself"""
+        try:
+            # on_exit closes the menu modal if a test left it open
+            self.main_screen.on_exit()
+        except Exception as e:
+            self.log_error(f"Main screen reset failed: {e}")
+    
     def test_toolbar_elements(self):
         """Test that all toolbar elements are present and visible"""
         try:
             self.log_info("Testing toolbar elements...")
             
-            # Check if toolbar exists
-            toolbar = self.main_screen.widgets.get('toolbar')
-            if not self.verify_widget_visible(toolbar, "toolbar"):
-                return False
-            
-            # Check menu button
-            menu_btn = self.main_screen.widgets.get('menu_btn')
-            if not self.verify_widget_visible(menu_btn, "menu button"):
-                return False
-            
-            # Check title button
-            title_btn = self.main_screen.widgets.get('title_btn')
-            if not self.verify_widget_visible(title_btn, "title button"):
-                return False
-            
-            # Check WiFi icon
-            wifi_icon = self.main_screen.widgets.get('wifi_icon')
-            if not self.verify_widget_visible(wifi_icon, "WiFi icon"):
-                return False
-            
-            # Check main area
-            main_area = self.main_screen.widgets.get('main_area')
-            if not self.verify_widget_visible(main_area, "main area"):
-                return False
+            # Check exactly the widgets the screen declares as required
+            widgets = self.main_screen.widgets
+            for key in self.main_screen.REQUIRED_WIDGETS:
+                if not self.verify_widget_visible(widgets.get(key), WIDGET_NAMES.get(key, key)):
+                    return False
             
             self.log_pass("All toolbar elements are present and visible")
             return True
@@ -116,9 +121,8 @@ class MainScreenUITest(BaseUITest):
         try:
             self.log_info("Testing menu button interaction...")
             
-            menu_btn = self.main_screen.widgets.get('menu_btn')
-            if not menu_btn:
-                self.log_fail("Menu button not found")
+            menu_btn = self.require_widget(self.main_screen, 'menu_btn', "Menu button")
+            if menu_btn is None:
                 return False
             
             # Click menu button
@@ -126,7 +130,7 @@ class MainScreenUITest(BaseUITest):
                 return False
             
             # Wait for menu to appear
-            self.wait_for_ui_update(500)
+            self.wait_until(lambda: self.main_screen.menu_modal is not None, 500)
             
             # Check if menu modal appeared
             if self.main_screen.menu_modal:
@@ -143,7 +147,7 @@ class MainScreenUITest(BaseUITest):
                 if not self.simulate_click(self.main_screen.menu_modal):
                     return False
                 
-                self.wait_for_ui_update(300)
+                self.wait_until(lambda: self.main_screen.menu_modal is None, 300)
                 
                 # Verify menu closed
                 if not self.main_screen.menu_modal:
@@ -165,16 +169,15 @@ class MainScreenUITest(BaseUITest):
         try:
             self.log_info("Testing title button interaction...")
             
-            title_btn = self.main_screen.widgets.get('title_btn')
-            if not title_btn:
-                self.log_fail("Title button not found")
+            title_btn = self.require_widget(self.main_screen, 'title_btn', "Title button")
+            if title_btn is None:
                 return False
             
             # Verify title text shows current system
             title_label = self.main_screen.widgets.get('title_label')
             if title_label:
                 title_text = title_label.get_text()
-                self.log_info(f"Title text: {title_text}")
+                self.log_info("Title text: %s", title_text)
                 
                 # Should contain system information
                 if "VW" in title_text or "Bosch" in title_text or "RPM" in title_text:
@@ -198,19 +201,17 @@ class MainScreenUITest(BaseUITest):
         try:
             self.log_info("Testing WiFi status display...")
             
-            wifi_icon = self.main_screen.widgets.get('wifi_icon')
-            if not wifi_icon:
-                self.log_fail("WiFi icon not found")
+            wifi_icon = self.require_widget(self.main_screen, 'wifi_icon', "WiFi icon")
+            if wifi_icon is None:
                 return False
             
-            wifi_label = self.main_screen.widgets.get('wifi_label')
-            if not wifi_label:
-                self.log_fail("WiFi label not found")
+            wifi_label = self.require_widget(self.main_screen, 'wifi_label', "WiFi label")
+            if wifi_label is None:
                 return False
             
             # Check WiFi icon text (should be WiFi symbol)
             wifi_text = wifi_label.get_text()
-            if lv.SYMBOL.WIFI in wifi_text:
+            if _WIFI_SYMBOL in wifi_text:
                 self.log_pass("WiFi icon displays WiFi symbol")
             else:
                 self.log_fail("WiFi icon does not display WiFi symbol")
@@ -231,13 +232,12 @@ class MainScreenUITest(BaseUITest):
         try:
             self.log_info("Testing tool loading...")
             
-            main_area = self.main_screen.widgets.get('main_area')
-            if not main_area:
-                self.log_fail("Main area not found")
+            main_area = self.require_widget(self.main_screen, 'main_area', "Main area")
+            if main_area is None:
                 return False
             
             # Wait for tool to load
-            self.wait_for_ui_update(1000)
+            self.wait_until(lambda: main_area.get_child_cnt() > 0 and self.main_screen.current_tool_screen, 1000)
             
             # Check if main area has content (tool loaded)
             if main_area.get_child_cnt() > 0:
@@ -247,18 +247,19 @@ class MainScreenUITest(BaseUITest):
                 if self.main_screen.current_tool_screen:
                     self.log_pass("Current tool screen instance created")
                     
-                    # Look for RPM simulator elements
-                    rpm_display = UITestHelpers.find_label_by_text(main_area, "RPM")
+                    # Look for RPM simulator elements in a single tree walk
+                    snap = UITestHelpers.snapshot(main_area)
+                    rpm_display = UITestHelpers.find_label_by_text(main_area, "RPM", snap)
                     if rpm_display:
                         self.log_pass("Found RPM display element")
                     
-                    sliders = UITestHelpers.get_all_sliders(main_area)
+                    sliders = UITestHelpers.get_all_sliders(main_area, snap)
                     if sliders:
-                        self.log_pass(f"Found {len(sliders)} slider(s) in tool area")
+                        self.log_pass("Found %d slider(s) in tool area", len(sliders))
                     
-                    buttons = UITestHelpers.get_all_buttons(main_area)
+                    buttons = UITestHelpers.get_all_buttons(main_area, snap)
                     if buttons:
-                        self.log_pass(f"Found {len(buttons)} button(s) in tool area")
+                        self.log_pass("Found %d button(s) in tool area", len(buttons))
                 
                 return True
             else:
@@ -274,7 +275,8 @@ class MainScreenUITest(BaseUITest):
         try:
             self.log_info("Testing complete navigation flow...")
             
-            # Define navigation steps
+            # Define navigation steps; the menu modal only exists after the first
+            # click, so it is looked up lazily with 'get_target'
             navigation_steps = [
                 {
                     'description': 'Click menu button',
@@ -282,29 +284,28 @@ class MainScreenUITest(BaseUITest):
                     'target': self.main_screen.widgets.get('menu_btn'),
                     'verify': {
                         'type': 'visible',
-                        'target': self.main_screen.menu_modal,
+                        'get_target': lambda: self.main_screen.menu_modal,
+                        'until': lambda: self.main_screen.menu_modal is not None,
+                        'timeout': 300,
                         'name': 'menu modal'
                     }
                 },
-                {
-                    'description': 'Wait for menu to stabilize',
-                    'action': 'wait',
-                    'duration': 300
-                },
                 {
                     'description': 'Click outside menu to close',
                     'action': 'click',
-                    'target': self.main_screen.menu_modal
+                    'get_target': lambda: self.main_screen.menu_modal
                 },
                 {
                     'description': 'Wait for menu to close',
                     'action': 'wait',
+                    'until': lambda: self.main_screen.menu_modal is None,
                     'duration': 300
                 }
             ]
             
-            # Execute navigation flow
-            success = UITestHelpers.simulate_navigation_flow(self, navigation_steps)
+            # Compile the flow once, then execute it
+            plan = UITestHelpers.compile_flow(self, navigation_steps)
+            success = UITestHelpers.run_flow(self, plan)
             
             if success:
                 self.log_pass("Complete navigation flow test passed")
@@ -322,30 +323,46 @@ class MainScreenUITest(BaseUITest):
         try:
             self.log_info("Starting Main Screen UI Tests...")
             
-            # Setup test environment
+            # Setup test environment; the main screen is built once and shared by all tests
             if not self.setup_test_environment():
                 return False
             
-            # Run individual tests
+            # Run individual tests in order: they drive the one shared MainScreen
+            # on the single SDL display, and LVGL must only be used from one thread
+            # Each entry is (test, prerequisite it needs, prerequisite it provides);
+            # a test is skipped when its prerequisite did not pass
             tests = [
-                self.test_toolbar_elements,
-                self.test_menu_button_interaction,
-                self.test_title_button_interaction,
-                self.test_wifi_status_display,
-                self.test_tool_loading,
-                self.test_complete_navigation_flow
+                (self.test_toolbar_elements, None, 'toolbar'),
+                (self.test_menu_button_interaction, 'toolbar', 'menu'),
+                (self.test_title_button_interaction, 'toolbar', None),
+                (self.test_wifi_status_display, 'toolbar', None),
+                (self.test_tool_loading, 'toolbar', None),
+                (self.test_complete_navigation_flow, 'menu', None)
             ]
             
             passed_tests = 0
-            for test in tests:
+            satisfied = set()
+            for test, requires, provides in tests:
+                if requires is not None and requires not in satisfied:
+                    self.log_info("Skipping %s: prerequisite '%s' failed", test.__name__, requires)
+                    continue
+                passed = False
                 try:
-                    if test():
-                        passed_tests += 1
+                    passed = test()
                 except Exception as e:
                     self.log_error(f"Test {test.__name__} crashed: {e}")
+                self.reset_main_screen()
+                self.flush_log()
+                if passed:
+                    passed_tests += 1
+                    if provides is not None:
+                        satisfied.add(provides)
+                elif _FAIL_FAST:
+                    self.log_info("Stopping after %s failed (FAIL_FAST)", test.__name__)
+                    break
             
             # Print summary
-            self.log_info(f"Completed {passed_tests}/{len(tests)} tests successfully")
+            self.log_info("Completed %d/%d tests successfully", passed_tests, len(tests))
             self.print_summary()
             
             return passed_tests == len(tests)
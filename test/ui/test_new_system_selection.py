@@ -16,161 +16,162 @@ sys.path.append('test')
 
 import lvgl as lv
 
+# Output is collected here and written with a single write by _flush()
+_out = []
+
+def _p(line=""):
+    """Queue a line of test output"""
+    _out.append(line)
+
+def _flush():
+    """Write all queued output at once"""
+    if _out:
+        sys.stdout.write('\n'.join(_out) + '\n')
+        _out.clear()
+
+# Widgets SystemSelectionScreen must create, checked by test 1
+EXPECTED_WIDGETS = (
+    'left_container', 'right_container', 'list_title', 'system_list',
+    'search_display', 'clear_btn', 'keyboard', 'close_btn'
+)
+
+# Widgets whose size test 8 reports, with their display names
+LAYOUT_WIDGETS = (
+    ('left_container', "Left container"),
+    ('right_container', "Right container"),
+    ('system_list', "System list"),
+    ('keyboard', "Keyboard"),
+)
+
+def _dims(widget):
+    """Return (width, height) from a single get_coords call"""
+    area = lv.area_t()
+    widget.get_coords(area)
+    return area.x2 - area.x1 + 1, area.y2 - area.y1 + 1
+
 def test_new_system_selection():
     """Test the new system selection screen with search functionality"""
-    print("==================================================")
-    print("NEW SYSTEM SELECTION - COMPREHENSIVE TEST")
-    print("==================================================")
+    _p("==================================================")
+    _p("NEW SYSTEM SELECTION - COMPREHENSIVE TEST")
+    _p("==================================================")
     
     try:
-        # Initialize LVGL
-        lv.init()
-        
-        # Create display
-        display = lv.sdl_window_create(800, 480)
-        lv.sdl_window_set_title(display, "New System Selection Test")
-        
-        # Create mouse
-        mouse = lv.sdl_mouse_create()
+        # Initialize LVGL, display and mouse (reused if another test already created them)
+        from ui.utils.base_ui_test import shared_display
+        display, mouse = shared_display("New System Selection Test")
         
         # Get screen
         screen = lv.screen_active()
         
-        print("✓ LVGL setup completed")
+        _p("✓ LVGL setup completed")
         
         # Import modules
-        from utils.navigation_manager import NavigationManager, AppState, nav_manager, app_state
-        from utils.data_manager import DataManager
-        from utils.error_handler import ErrorHandler
+        from utils.navigation_manager import nav_manager, app_state
         from screens.system_selection import SystemSelectionScreen
         
-        print("✓ All modules imported successfully")
-        
-        # Initialize app state
-        if not hasattr(app_state, 'data_manager') or not app_state.data_manager:
-            app_state.data_manager = DataManager()
-        if not hasattr(app_state, 'error_handler') or not app_state.error_handler:
-            app_state.error_handler = ErrorHandler()
-        
-        print("✓ App state initialized")
+        _p("✓ All modules imported successfully")
         
         # Register screen
         nav_manager.register_screen("system_selection", SystemSelectionScreen)
         
         # Test 1: Create system selection screen directly
-        print("\n1. Testing System Selection Screen Creation...")
+        _p("\n1. Testing System Selection Screen Creation...")
         selection_screen = SystemSelectionScreen(screen)
         
         # Check all required widgets
-        expected_widgets = [
-            'left_container', 'right_container', 'list_title', 'system_list',
-            'search_display', 'clear_btn', 'keyboard', 'close_btn'
-        ]
-        
-        widget_test_passed = 0
-        for widget_name in expected_widgets:
-            if widget_name in selection_screen.widgets:
-                print(f"✓ Found widget: {widget_name}")
-                widget_test_passed += 1
-            else:
-                print(f"✗ Missing widget: {widget_name}")
+        missing = set(EXPECTED_WIDGETS).difference(selection_screen.widgets)
+        widget_test_passed = len(EXPECTED_WIDGETS) - len(missing)
+        for widget_name in EXPECTED_WIDGETS:
+            if widget_name in missing:
+                _p(f"✗ Missing widget: {widget_name}")
         
-        print(f"Widget Test: {widget_test_passed}/{len(expected_widgets)} widgets found")
+        _p(f"Widget Test: {widget_test_passed}/{len(EXPECTED_WIDGETS)} widgets found")
         
         # Test 2: Check initial state
-        print("\n2. Testing Initial State...")
-        print(f"✓ Search text: '{selection_screen.search_text}'")
-        print(f"✓ Is searching: {selection_screen.is_searching}")
-        print(f"✓ Current view: {selection_screen.current_view}")
-        print(f"✓ Selected brand: {selection_screen.selected_brand}")
-        print(f"✓ All systems loaded: {len(selection_screen.all_systems)} systems")
+        _p("\n2. Testing Initial State...")
+        _p(f"✓ Search text: '{selection_screen.search_text}'")
+        _p(f"✓ Is searching: {selection_screen.is_searching}")
+        _p(f"✓ Current view: {selection_screen.current_view}")
+        _p(f"✓ Selected brand: {selection_screen.selected_brand}")
+        _p(f"✓ All systems loaded: {len(selection_screen.all_systems)} systems")
         
         # Test 3: Test brand display
-        print("\n3. Testing Brand Display...")
+        _p("\n3. Testing Brand Display...")
         brands = app_state.data_manager.get_brands()
-        print(f"✓ Available brands: {brands}")
+        _p(f"✓ Available brands: {brands}")
         
         # Test 4: Test search functionality
-        print("\n4. Testing Search Functionality...")
+        _p("\n4. Testing Search Functionality...")
         
         # Simulate search text input
         selection_screen.search_text = "VW"
         selection_screen.is_searching = True
         selection_screen.update_list_display()
-        print("✓ Search for 'VW' completed")
+        _p("✓ Search for 'VW' completed")
         
         # Test clear search
         selection_screen.search_text = ""
         selection_screen.is_searching = False
         selection_screen.current_view = "brands"
         selection_screen.update_list_display()
-        print("✓ Clear search completed")
+        _p("✓ Clear search completed")
         
         # Test 5: Test brand selection
-        print("\n5. Testing Brand Selection...")
-        if brands:
-            test_brand = brands[0]
+        _p("\n5. Testing Brand Selection...")
+        test_brand = app_state.data_manager.first_brand
+        if test_brand:
             selection_screen.on_brand_select(None, test_brand)
-            print(f"✓ Selected brand: {selection_screen.selected_brand}")
-            print(f"✓ Current view: {selection_screen.current_view}")
+            _p(f"✓ Selected brand: {selection_screen.selected_brand}")
+            _p(f"✓ Current view: {selection_screen.current_view}")
         
         # Test 6: Test system selection
-        print("\n6. Testing System Selection...")
+        _p("\n6. Testing System Selection...")
         if selection_screen.selected_brand:
-            system_types = app_state.data_manager.get_system_types(selection_screen.selected_brand)
-            if system_types:
-                system_names = app_state.data_manager.get_system_names(selection_screen.selected_brand, system_types[0])
-                if system_names:
+            system_type = app_state.data_manager.first_system_type(selection_screen.selected_brand)
+            if system_type:
+                system_name = app_state.data_manager.first_system_name(selection_screen.selected_brand, system_type)
+                if system_name:
                     test_system = {
-                        'type': system_types[0],
-                        'name': system_names[0]
+                        'type': system_type,
+                        'name': system_name
                     }
-                    print(f"✓ Testing system selection: {test_system}")
+                    _p(f"✓ Testing system selection: {test_system}")
                     # Note: We don't actually call on_system_select as it would navigate away
         
         # Test 7: Test filtered system selection
-        print("\n7. Testing Filtered System Selection...")
+        _p("\n7. Testing Filtered System Selection...")
         if selection_screen.all_systems:
             test_filtered_system = selection_screen.all_systems[0]
-            print(f"✓ Testing filtered system: {test_filtered_system}")
+            _p(f"✓ Testing filtered system: {test_filtered_system}")
             # Note: We don't actually call on_filtered_system_select as it would navigate away
         
         # Test 8: Test layout and sizing
-        print("\n8. Testing Layout and Sizing...")
-        
-        # Check left container
-        left_container = selection_screen.widgets['left_container']
-        print(f"✓ Left container size: {left_container.get_width()}x{left_container.get_height()}")
-        
-        # Check right container
-        right_container = selection_screen.widgets['right_container']
-        print(f"✓ Right container size: {right_container.get_width()}x{right_container.get_height()}")
-        
-        # Check system list
-        system_list = selection_screen.widgets['system_list']
-        print(f"✓ System list size: {system_list.get_width()}x{system_list.get_height()}")
+        _p("\n8. Testing Layout and Sizing...")
         
-        # Check keyboard
-        keyboard = selection_screen.widgets['keyboard']
-        print(f"✓ Keyboard size: {keyboard.get_width()}x{keyboard.get_height()}")
+        for key, name in LAYOUT_WIDGETS:
+            width, height = _dims(selection_screen.widgets[key])
+            _p(f"✓ {name} size: {width}x{height}")
         
-        print("\n✓ New System Selection test completed successfully!")
+        _p("\n✓ New System Selection test completed successfully!")
         return True
         
     except Exception as e:
-        print(f"✗ New System Selection test failed: {e}")
+        _p(f"✗ New System Selection test failed: {e}")
         return False
+    finally:
+        _flush()
 
 if __name__ == "__main__":
     success = test_new_system_selection()
     if success:
-        print("\n🎉 NEW SYSTEM SELECTION TEST PASSED!")
-        print("\n✅ All new UI features are working correctly!")
-        print("✅ Full-screen layout implemented")
-        print("✅ Search functionality working")
-        print("✅ Virtual keyboard integrated")
-        print("✅ Brand and system selection working")
-        print("✅ Filtered search results working")
-        print("✅ All widgets properly created and sized")
+        _p("\n🎉 NEW SYSTEM SELECTION TEST PASSED!")
+        _p("\n✅ All new UI features are working correctly!")
+        _p("✅ Full-screen layout implemented")
+        _p("✅ Search functionality working")
+        _p("✅ Virtual keyboard integrated")
+        _p("✅ Brand and system selection working")
+        _p("✅ Filtered search results working")
+        _p("✅ All widgets properly created and sized")
     else:
-        print("\n❌ NEW SYSTEM SELECTION TEST FAILED!")
+        _p("\n❌ NEW SYSTEM SELECTION TEST FAILED!")
+    _flush()
@@ -16,6 +16,19 @@ sys.path.append('test')
 import lvgl as lv
 from ui.utils.base_ui_test import BaseUITest
 
+# (widget key, description) pairs that must be visible, per test
+LAYOUT_WIDGETS = (
+    ('left_container', "left container"),
+    ('right_container', "right container"),
+    ('system_list', "system list"),
+    ('list_title', "list title"),
+)
+SEARCH_WIDGETS = (
+    ('search_display', "search display"),
+    ('clear_btn', "clear button"),
+    ('keyboard', "virtual keyboard"),
+)
+
 class NewSystemSelectionUITest(BaseUITest):
     """Test class for new system selection screen UI"""
     
@@ -29,23 +42,17 @@ class NewSystemSelectionUITest(BaseUITest):
             self.log_info("Setting up new system selection test environment...")
             
             # Import required modules
-            from utils.navigation_manager import NavigationManager, AppState, nav_manager, app_state
-            from utils.data_manager import DataManager
-            from utils.error_handler import ErrorHandler
             from screens.system_selection import SystemSelectionScreen
+            from utils.navigation_manager import app_state
 
-            # Use global app_state instance and initialize it
+            # Use global app_state instance
             self.app_state = app_state
-            if not hasattr(self.app_state, 'data_manager') or not self.app_state.data_manager:
-                self.app_state.data_manager = DataManager()
-            if not hasattr(self.app_state, 'error_handler') or not self.app_state.error_handler:
-                self.app_state.error_handler = ErrorHandler()
 
             # Create system selection screen
             self.selection_screen = SystemSelectionScreen(self.screen)
 
-            # Wait for screen to initialize
-            self.wait_for_ui_update(500)
+            # Let the first render settle
+            self.wait_for_ui_idle()
 
             self.log_pass("New System Selection test environment setup completed")
             return True
@@ -54,29 +61,20 @@ class NewSystemSelectionUITest(BaseUITest):
             self.log_error(f"Test environment setup failed: {e}")
             return False
     
+    def verify_widgets_visible(self, widgets):
+        """Check each (key, description) widget of the selection screen is visible"""
+        for key, description in widgets:
+            if not self.verify_widget_visible(self.selection_screen.widgets.get(key), description):
+                return False
+        return True
+    
     def test_full_screen_layout(self):
         """Test full-screen layout elements"""
         try:
             self.log_info("Testing full-screen layout...")
             
-            # Check left container
-            left_container = self.selection_screen.widgets.get('left_container')
-            if not self.verify_widget_visible(left_container, "left container"):
-                return False
-            
-            # Check right container
-            right_container = self.selection_screen.widgets.get('right_container')
-            if not self.verify_widget_visible(right_container, "right container"):
-                return False
-            
-            # Check system list
-            system_list = self.selection_screen.widgets.get('system_list')
-            if not self.verify_widget_visible(system_list, "system list"):
-                return False
-            
-            # Check list title
-            list_title = self.selection_screen.widgets.get('list_title')
-            if not self.verify_widget_visible(list_title, "list title"):
+            # Check containers, system list and list title
+            if not self.verify_widgets_visible(LAYOUT_WIDGETS):
                 return False
             
             self.log_pass("Full-screen layout test completed")
@@ -91,19 +89,8 @@ class NewSystemSelectionUITest(BaseUITest):
         try:
             self.log_info("Testing search functionality...")
             
-            # Check search display
-            search_display = self.selection_screen.widgets.get('search_display')
-            if not self.verify_widget_visible(search_display, "search display"):
-                return False
-            
-            # Check clear button
-            clear_btn = self.selection_screen.widgets.get('clear_btn')
-            if not self.verify_widget_visible(clear_btn, "clear button"):
-                return False
-            
-            # Check virtual keyboard
-            keyboard = self.selection_screen.widgets.get('keyboard')
-            if not self.verify_widget_visible(keyboard, "virtual keyboard"):
+            # Check search display, clear button and virtual keyboard
+            if not self.verify_widgets_visible(SEARCH_WIDGETS):
                 return False
             
             # Test search text input simulation
@@ -146,9 +133,8 @@ class NewSystemSelectionUITest(BaseUITest):
                 return False
             
             # Test brand selection
-            brands = self.app_state.data_manager.get_brands()
-            if brands:
-                test_brand = brands[0]
+            test_brand = self.app_state.data_manager.first_brand
+            if test_brand:
                 self.selection_screen.on_brand_select(None, test_brand)
                 
                 if self.selection_screen.selected_brand == test_brand:
@@ -217,11 +203,11 @@ class NewSystemSelectionUITest(BaseUITest):
             # Check system structure
             if self.selection_screen.all_systems:
                 system = self.selection_screen.all_systems[0]
-                required_keys = ['brand', 'system_type', 'system_name']
-                for key in required_keys:
-                    if key not in system:
-                        self.log_fail(f"System missing required key: {key}")
-                        return False
+                required_keys = ('brand', 'system_type', 'system_name')
+                missing = set(required_keys).difference(system)
+                if missing:
+                    self.log_fail("System missing required keys: %s", sorted(missing))
+                    return False
                 self.log_pass("System data structure correct")
             
             self.log_pass("Data integration test completed")
@@ -249,19 +235,26 @@ class NewSystemSelectionUITest(BaseUITest):
         for test in tests:
             if test():
                 passed += 1
-            self.wait_for_ui_update(100)  # Small delay between tests
+            # Undo whatever view the test left behind before the next one
+            self.selection_screen.reset_state()
+            self.flush_log()
         
         self.log_info(f"New System Selection tests completed: {passed}/{total} passed")
         return passed == total
 
 if __name__ == "__main__":
     test = NewSystemSelectionUITest()
-    if test.setup_test_environment():
-        success = test.run_all_tests()
-        test.cleanup()
-        if success:
-            print("🎉 New System Selection UI tests PASSED!")
+    try:
+        if test.setup_test_environment():
+            success = test.run_all_tests()
         else:
-            print("❌ New System Selection UI tests FAILED!")
-    else:
+            success = None
+    finally:
+        # cleanup() also flushes the buffered log, including any setup error
+        test.cleanup()
+    if success is None:
         print("❌ Test environment setup failed!")
+    elif success:
+        print("🎉 New System Selection UI tests PASSED!")
+    else:
+        print("❌ New System Selection UI tests FAILED!")
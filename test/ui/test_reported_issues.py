@@ -8,8 +8,14 @@ import utime as time
 import sys
 import os
 
-# Add src to path for imports
+# Add src and test to path for imports
 sys.path.insert(0, 'src')
+sys.path.append('test')
+
+from ui.utils.app_state_helper import register_all_screens
+
+# Screens the navigation tests expect nav_manager to know about
+REQUIRED_SCREENS = ("main", "system_selection", "wifi_setup")
 
 def test_dialog_parameter_order():
     """Test that dialog functions are called with correct parameter order"""
@@ -41,10 +47,9 @@ def test_wifi_setup_screen_registration():
     
     try:
         from utils.navigation_manager import nav_manager
-        from screens.wifi_setup import WifiSetupScreen
         
         # Register the screen
-        nav_manager.register_screen("wifi_setup", WifiSetupScreen)
+        register_all_screens()
         
         # Check if it's registered
         if "wifi_setup" in nav_manager.screens:
@@ -72,15 +77,7 @@ def test_system_selection_data_loading():
     print("\n=== Testing System Selection Data Loading ===")
     
     try:
-        from utils.data_manager import DataManager
         from utils.navigation_manager import app_state
-        from utils.error_handler import ErrorHandler
-        
-        # Initialize app state if needed
-        if not hasattr(app_state, 'data_manager') or not app_state.data_manager:
-            app_state.data_manager = DataManager()
-        if not hasattr(app_state, 'error_handler') or not app_state.error_handler:
-            app_state.error_handler = ErrorHandler()
         
         # Test data loading
         brands = app_state.data_manager.get_brands()
@@ -156,15 +153,6 @@ def test_main_screen_menu_functionality():
     
     try:
         from screens.main_screen import MainScreen
-        from utils.navigation_manager import app_state
-        from utils.data_manager import DataManager
-        from utils.error_handler import ErrorHandler
-        
-        # Initialize app state
-        if not hasattr(app_state, 'data_manager') or not app_state.data_manager:
-            app_state.data_manager = DataManager()
-        if not hasattr(app_state, 'error_handler') or not app_state.error_handler:
-            app_state.error_handler = ErrorHandler()
         
         # Create a minimal screen object
         scr = lv.obj()
@@ -192,27 +180,18 @@ def test_screen_registrations():
     
     try:
         from utils.navigation_manager import nav_manager
-        from screens.main_screen import MainScreen
-        from screens.system_selection import SystemSelectionScreen
-        from screens.wifi_setup import WifiSetupScreen
         
         # Register all screens
-        nav_manager.register_screen("main", MainScreen)
-        nav_manager.register_screen("system_selection", SystemSelectionScreen)
-        nav_manager.register_screen("wifi_setup", WifiSetupScreen)
+        register_all_screens()
         
         # Check registrations
-        required_screens = ["main", "system_selection", "wifi_setup"]
-        all_registered = True
-        
-        for screen_name in required_screens:
-            if screen_name in nav_manager.screens:
-                print(f"✓ {screen_name} screen registered")
-            else:
-                print(f"✗ {screen_name} screen NOT registered")
-                all_registered = False
+        missing = set(REQUIRED_SCREENS).difference(nav_manager.screens)
+        if missing:
+            print(f"✗ Screens NOT registered: {sorted(missing)}")
+            return False
         
-        return all_registered
+        print(f"✓ All {len(REQUIRED_SCREENS)} required screens registered")
+        return True
         
     except Exception as e:
         print(f"✗ Screen registration test failed: {e}")
@@ -236,6 +215,8 @@ def run_all_issue_tests():
         ("Screen Registrations", test_screen_registrations),
     ]
     
+    # Run in sequence: the tests share app_state, nav_manager and the LVGL
+    # context, and MicroPython has no multiprocessing to isolate them
     results = []
     for test_name, test_func in tests:
         try:
@@ -246,26 +227,15 @@ def run_all_issue_tests():
             results.append((test_name, False))
     
     # Print summary
-    print("\n" + "=" * 50)
-    print("ISSUE TEST SUMMARY")
-    print("=" * 50)
-    
-    passed = 0
-    for test_name, result in results:
-        status = "✓ PASS" if result else "✗ FAIL"
-        print(f"{status}: {test_name}")
-        if result:
-            passed += 1
-    
+    passed = sum(1 for _, result in results if result)
     total = len(results)
-    print(f"\nResults: {passed}/{total} tests passed")
+    out = ["", "=" * 50, "ISSUE TEST SUMMARY", "=" * 50]
+    out.extend(f"{'✓ PASS' if result else '✗ FAIL'}: {test_name}" for test_name, result in results)
+    out.append(f"\nResults: {passed}/{total} tests passed")
+    out.append("🎉 All reported issues are fixed!" if passed == total else "❌ Some issues still exist!")
+    sys.stdout.write('\n'.join(out) + '\n')
     
-    if passed == total:
-        print("🎉 All reported issues are fixed!")
-        return True
-    else:
-        print("❌ Some issues still exist!")
-        return False
+    return passed == total
 
 def main():
     """Main test function"""
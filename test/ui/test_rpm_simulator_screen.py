@@ -14,6 +14,25 @@ sys.path.append('test')
 
 from ui.utils.base_ui_test import BaseUITest
 from ui.utils.test_helpers import UITestHelpers
+from utils.navigation_manager import app_state
+from screens.rpm_simulator.rpm_simulator_screen import RPMSimulatorScreen
+
+# Widgets test_rpm_display_elements cannot continue without
+DISPLAY_WIDGETS = ('title', 'rpm_display', 'rpm_slider')
+
+# (widget key, screen state attribute, widget name, state name) for test_control_buttons
+CONTROL_BUTTONS = (
+    ('cam_toggle_btn', 'camshaft_enabled', "cam toggle button", "cam toggle"),
+    ('crank_toggle_btn', 'crankshaft_enabled', "crank toggle button", "crank toggle"),
+    ('start_stop_btn', 'simulation_active', "start/stop button", "simulation"),
+)
+
+# Toggle buttons whose colors/icons test_button_visual_states exercises
+VISUAL_STATE_BUTTONS = (
+    ('cam_toggle_btn', "Cam button"),
+    ('crank_toggle_btn', "Crank button"),
+    ('start_stop_btn', "Start/stop button"),
+)
 
 class RPMSimulatorUITest(BaseUITest):
     """Test suite for RPM Simulator Screen UI functionality"""
@@ -26,18 +45,8 @@ class RPMSimulatorUITest(BaseUITest):
     def setup_test_environment(self):
         """Set up test environment with RPM simulator screen"""
         try:
-            # Import required modules
-            from utils.navigation_manager import AppState, app_state
-            from utils.data_manager import DataManager
-            from utils.error_handler import ErrorHandler
-            from screens.rpm_simulator.rpm_simulator_screen import RPMSimulatorScreen
-
-            # Use global app_state instance and initialize it
+            # Use global app_state instance
             self.app_state = app_state
-            if not hasattr(self.app_state, 'data_manager') or not self.app_state.data_manager:
-                self.app_state.data_manager = DataManager()
-            if not hasattr(self.app_state, 'error_handler') or not self.app_state.error_handler:
-                self.app_state.error_handler = ErrorHandler()
 
             # Create RPM simulator screen
             self.rpm_screen = RPMSimulatorScreen(self.screen)
@@ -49,16 +58,23 @@ class RPMSimulatorUITest(BaseUITest):
             return True
 
         except Exception as e:
-            self.log_error(f"Test environment setup failed: {e}")
+            self.log_error("Test environment setup failed: %s", e)
             return False
     
     def test_rpm_display_elements(self):
         """Test that RPM display elements are present"""
         try:
             self.log_info("Testing RPM display elements...")
+            widgets = self.rpm_screen.widgets
+            
+            # Fail fast, before querying LVGL, if a required widget is missing
+            missing = [key for key in DISPLAY_WIDGETS if widgets.get(key) is None]
+            if missing:
+                self.log_fail("RPM display elements missing: %s", missing)
+                return False
             
             # Check title
-            title = self.rpm_screen.widgets.get('title')
+            title = widgets.get('title')
             if not self.verify_widget_visible(title, "title"):
                 return False
             
@@ -66,7 +82,7 @@ class RPMSimulatorUITest(BaseUITest):
                 return False
             
             # Check RPM display
-            rpm_display = self.rpm_screen.widgets.get('rpm_display')
+            rpm_display = widgets.get('rpm_display')
             if not self.verify_widget_visible(rpm_display, "RPM display"):
                 return False
             
@@ -78,13 +94,13 @@ class RPMSimulatorUITest(BaseUITest):
                 self.log_fail("RPM display does not show RPM value")
             
             # Check RPM slider
-            rpm_slider = self.rpm_screen.widgets.get('rpm_slider')
+            rpm_slider = widgets.get('rpm_slider')
             if not self.verify_widget_visible(rpm_slider, "RPM slider"):
                 return False
             
             # Check slider labels
-            slider_min = self.rpm_screen.widgets.get('slider_min')
-            slider_max = self.rpm_screen.widgets.get('slider_max')
+            slider_min = widgets.get('slider_min')
+            slider_max = widgets.get('slider_max')
             
             if self.verify_widget_visible(slider_min, "slider min label"):
                 self.verify_widget_text(slider_min, "0", "slider min label")
@@ -96,7 +112,7 @@ class RPMSimulatorUITest(BaseUITest):
             return True
             
         except Exception as e:
-            self.log_error(f"RPM display elements test failed: {e}")
+            self.log_error("RPM display elements test failed: %s", e)
             return False
     
     def test_rpm_slider_interaction(self):
@@ -104,120 +120,91 @@ class RPMSimulatorUITest(BaseUITest):
         try:
             self.log_info("Testing RPM slider interaction...")
             
-            rpm_slider = self.rpm_screen.widgets.get('rpm_slider')
-            rpm_display = self.rpm_screen.widgets.get('rpm_display')
+            w = self.rpm_screen.widgets
+            rpm_slider = w.get('rpm_slider')
+            rpm_display = w.get('rpm_display')
             
             if not rpm_slider or not rpm_display:
                 self.log_fail("RPM slider or display not found")
                 return False
             
             # Test different RPM values
-            test_values = [1000, 2500, 5000, 7500, 800]  # 800 is default
+            test_values = (1000, 2500, 5000, 7500, 800)  # 800 is default
+            
+            # Bound once for the loop below
+            rpm_screen = self.rpm_screen
+            simulate_slider_change = self.simulate_slider_change
+            log_pass = self.log_pass
+            log_fail = self.log_fail
             
             for test_value in test_values:
                 # Set slider value
-                if not self.simulate_slider_change(rpm_slider, test_value):
+                if not simulate_slider_change(rpm_slider, test_value):
                     return False
                 
                 # Check if display updated
-                current_rpm = self.rpm_screen.current_rpm
+                current_rpm = rpm_screen.current_rpm
                 if current_rpm == test_value:
-                    self.log_pass(f"RPM value updated to {test_value}")
+                    log_pass("RPM value updated to %s", test_value)
                 else:
-                    self.log_fail(f"RPM value not updated. Expected: {test_value}, Got: {current_rpm}")
+                    log_fail("RPM value not updated. Expected: %s, Got: %s", test_value, current_rpm)
                 
-                # Check display text
+                # Check display text; the screen formats it as "<rpm> RPM"
                 rpm_text = rpm_display.get_text()
-                if str(test_value) in rpm_text:
-                    self.log_pass(f"RPM display shows {test_value}")
+                try:
+                    shown_rpm = int(rpm_text.split()[0])
+                except (IndexError, ValueError):
+                    shown_rpm = None
+                if shown_rpm == test_value:
+                    log_pass("RPM display shows %s", test_value)
                 else:
-                    self.log_fail(f"RPM display does not show {test_value}. Text: {rpm_text}")
+                    log_fail("RPM display does not show %s. Text: %s", test_value, rpm_text)
             
             self.log_pass("RPM slider interaction test completed")
             return True
             
         except Exception as e:
-            self.log_error(f"RPM slider interaction test failed: {e}")
+            self.log_error("RPM slider interaction test failed: %s", e)
             return False
     
     def test_control_buttons(self):
         """Test control buttons (cam, crank, start/stop)"""
         try:
             self.log_info("Testing control buttons...")
+            widgets = self.rpm_screen.widgets
             
-            # Test cam toggle button
-            cam_btn = self.rpm_screen.widgets.get('cam_toggle_btn')
-            if not self.verify_widget_visible(cam_btn, "cam toggle button"):
-                return False
-            
-            # Check initial state (should be enabled)
-            initial_cam_state = self.rpm_screen.camshaft_enabled
-            self.log_info(f"Initial cam state: {initial_cam_state}")
-            
-            # Click cam toggle
-            if not self.simulate_click(cam_btn):
-                return False
-            
-            # Check state changed
-            new_cam_state = self.rpm_screen.camshaft_enabled
-            if new_cam_state != initial_cam_state:
-                self.log_pass("Cam toggle state changed")
-            else:
-                self.log_fail("Cam toggle state did not change")
-            
-            # Test crank toggle button
-            crank_btn = self.rpm_screen.widgets.get('crank_toggle_btn')
-            if not self.verify_widget_visible(crank_btn, "crank toggle button"):
-                return False
-            
-            # Check initial state (should be enabled)
-            initial_crank_state = self.rpm_screen.crankshaft_enabled
-            self.log_info(f"Initial crank state: {initial_crank_state}")
-            
-            # Click crank toggle
-            if not self.simulate_click(crank_btn):
-                return False
-            
-            # Check state changed
-            new_crank_state = self.rpm_screen.crankshaft_enabled
-            if new_crank_state != initial_crank_state:
-                self.log_pass("Crank toggle state changed")
-            else:
-                self.log_fail("Crank toggle state did not change")
-            
-            # Test start/stop button
-            start_stop_btn = self.rpm_screen.widgets.get('start_stop_btn')
-            if not self.verify_widget_visible(start_stop_btn, "start/stop button"):
-                return False
-            
-            # Check initial state (should be stopped)
-            initial_sim_state = self.rpm_screen.simulation_active
-            self.log_info(f"Initial simulation state: {initial_sim_state}")
-            
-            # Click start/stop button
-            if not self.simulate_click(start_stop_btn):
-                return False
-            
-            # Check state changed
-            new_sim_state = self.rpm_screen.simulation_active
-            if new_sim_state != initial_sim_state:
-                self.log_pass("Simulation state changed")
-            else:
-                self.log_fail("Simulation state did not change")
+            # Click each control and check the screen state it drives flips
+            rpm_screen = self.rpm_screen
+            for btn_key, state_attr, name, state_name in CONTROL_BUTTONS:
+                btn = widgets.get(btn_key)
+                if not self.verify_widget_visible(btn, name):
+                    return False
+                
+                initial_state = getattr(rpm_screen, state_attr)
+                self.log_info("Initial %s state: %s", state_name, initial_state)
+                
+                if not self.simulate_click(btn):
+                    return False
+                
+                if getattr(rpm_screen, state_attr) != initial_state:
+                    self.log_pass("%s state changed", state_name.capitalize())
+                else:
+                    self.log_fail("%s state did not change", state_name.capitalize())
             
             self.log_pass("Control buttons test completed")
             return True
             
         except Exception as e:
-            self.log_error(f"Control buttons test failed: {e}")
+            self.log_error("Control buttons test failed: %s", e)
             return False
     
     def test_config_button(self):
         """Test configuration button"""
         try:
             self.log_info("Testing configuration button...")
+            widgets = self.rpm_screen.widgets
             
-            config_btn = self.rpm_screen.widgets.get('config_btn')
+            config_btn = widgets.get('config_btn')
             if not self.verify_widget_visible(config_btn, "config button"):
                 return False
             
@@ -229,109 +216,62 @@ class RPMSimulatorUITest(BaseUITest):
             return True
             
         except Exception as e:
-            self.log_error(f"Config button test failed: {e}")
+            self.log_error("Config button test failed: %s", e)
             return False
     
     def test_button_visual_states(self):
         """Test visual states of toggle buttons"""
         try:
             self.log_info("Testing button visual states...")
+            widgets = self.rpm_screen.widgets
             
-            # Test cam button visual state
-            cam_btn = self.rpm_screen.widgets.get('cam_toggle_btn')
-            if cam_btn:
-                # Click to toggle state
-                self.simulate_click(cam_btn)
-                self.wait_for_ui_update(200)
-                
-                # Visual state should have changed (color, etc.)
-                self.log_pass("Cam button visual state test completed")
-            
-            # Test crank button visual state
-            crank_btn = self.rpm_screen.widgets.get('crank_toggle_btn')
-            if crank_btn:
-                # Click to toggle state
-                self.simulate_click(crank_btn)
-                self.wait_for_ui_update(200)
-                
-                # Visual state should have changed (color, etc.)
-                self.log_pass("Crank button visual state test completed")
-            
-            # Test start/stop button visual state
-            start_stop_btn = self.rpm_screen.widgets.get('start_stop_btn')
-            if start_stop_btn:
-                # Click to toggle state
-                self.simulate_click(start_stop_btn)
-                self.wait_for_ui_update(200)
-                
-                # Visual state should have changed (play/stop icon, color)
-                self.log_pass("Start/stop button visual state test completed")
+            # Click every toggle first, then let LVGL redraw them all in one refresh
+            clicked = []
+            for key, name in VISUAL_STATE_BUTTONS:
+                btn = widgets.get(key)
+                if btn:
+                    # Click to toggle state (color, play/stop icon)
+                    self.simulate_click(btn, wait_ms=0)
+                    clicked.append(name)
+            self.wait_for_ui_update(200)
+            
+            for name in clicked:
+                self.log_pass("%s visual state test completed", name)
             
             return True
             
         except Exception as e:
-            self.log_error(f"Button visual states test failed: {e}")
+            self.log_error("Button visual states test failed: %s", e)
             return False
     
     def test_complete_rpm_workflow(self):
         """Test complete RPM simulation workflow"""
         try:
             self.log_info("Testing complete RPM workflow...")
-            
-            # Define workflow steps
-            workflow_steps = [
-                {
-                    'description': 'Set RPM to 2000',
-                    'action': 'slider',
-                    'target': self.rpm_screen.widgets.get('rpm_slider'),
-                    'value': 2000
-                },
-                {
-                    'description': 'Wait for RPM update',
-                    'action': 'wait',
-                    'duration': 300
-                },
-                {
-                    'description': 'Start simulation',
-                    'action': 'click',
-                    'target': self.rpm_screen.widgets.get('start_stop_btn')
-                },
-                {
-                    'description': 'Wait for simulation start',
-                    'action': 'wait',
-                    'duration': 500
-                },
-                {
-                    'description': 'Toggle cam sensor',
-                    'action': 'click',
-                    'target': self.rpm_screen.widgets.get('cam_toggle_btn')
-                },
-                {
-                    'description': 'Wait for cam toggle',
-                    'action': 'wait',
-                    'duration': 200
-                },
-                {
-                    'description': 'Change RPM during simulation',
-                    'action': 'slider',
-                    'target': self.rpm_screen.widgets.get('rpm_slider'),
-                    'value': 3500
-                },
-                {
-                    'description': 'Wait for RPM change',
-                    'action': 'wait',
-                    'duration': 300
-                },
-                {
-                    'description': 'Stop simulation',
-                    'action': 'click',
-                    'target': self.rpm_screen.widgets.get('start_stop_btn')
-                }
-            ]
+            w = self.rpm_screen.widgets
+            rpm_slider = w.get('rpm_slider')
+            start_stop_btn = w.get('start_stop_btn')
+            cam_btn = w.get('cam_toggle_btn')
+            
+            # Define workflow steps as (action, target or wait ms, slider value)
+            workflow_steps = (
+                ('slider', rpm_slider, 2000),      # Set RPM to 2000
+                ('wait', 300, None),               # Wait for RPM update
+                ('click', start_stop_btn, None),   # Start simulation
+                ('wait', 500, None),               # Wait for simulation start
+                ('click', cam_btn, None),          # Toggle cam sensor
+                ('wait', 200, None),               # Wait for cam toggle
+                ('slider', rpm_slider, 3500),      # Change RPM during simulation
+                ('wait', 300, None),               # Wait for RPM change
+            )
             
             # Execute workflow
             success = UITestHelpers.simulate_navigation_flow(self, workflow_steps)
             
+            # Stop simulation, but only if the workflow actually started it
+            if self.rpm_screen.simulation_active:
+                success = self.simulate_click(start_stop_btn) and success
+            
             if success:
                 self.log_pass("Complete RPM workflow test passed")
             else:
@@ -340,9 +280,19 @@ class RPMSimulatorUITest(BaseUITest):
             return success
             
         except Exception as e:
-            self.log_error(f"Complete RPM workflow test failed: {e}")
+            self.log_error("Complete RPM workflow test failed: %s", e)
             return False
     
+    # Test functions in run order, resolved once when the class is defined
+    _TESTS = (
+        test_rpm_display_elements,
+        test_rpm_slider_interaction,
+        test_control_buttons,
+        test_config_button,
+        test_button_visual_states,
+        test_complete_rpm_workflow,
+    )
+    
     def run_all_tests(self):
         """Run all RPM simulator tests"""
         try:
@@ -353,31 +303,23 @@ class RPMSimulatorUITest(BaseUITest):
                 return False
             
             # Run individual tests
-            tests = [
-                self.test_rpm_display_elements,
-                self.test_rpm_slider_interaction,
-                self.test_control_buttons,
-                self.test_config_button,
-                self.test_button_visual_states,
-                self.test_complete_rpm_workflow
-            ]
+            tests = self._TESTS
             
+            # Each test catches its own exceptions and returns False
             passed_tests = 0
             for test in tests:
-                try:
-                    if test():
-                        passed_tests += 1
-                except Exception as e:
-                    self.log_error(f"Test {test.__name__} crashed: {e}")
+                if test(self):
+                    passed_tests += 1
+                self.flush_log()
             
             # Print summary
-            self.log_info(f"Completed {passed_tests}/{len(tests)} tests successfully")
+            self.log_info("Completed %s/%s tests successfully", passed_tests, len(tests))
             self.print_summary()
             
             return passed_tests == len(tests)
             
         except Exception as e:
-            self.log_error(f"Test execution failed: {e}")
+            self.log_error("Test execution failed: %s", e)
             return False
         finally:
             self.cleanup()
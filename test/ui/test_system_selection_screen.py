@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 System Selection Screen UI Tests for ECU Diagnostic Tool
-Tests 4-step selection process: Brand → System → System Name → Tool
+Tests brand and system lists, back navigation and list updates
 """
 
 import utime as time
@@ -14,6 +14,28 @@ sys.path.append('test')
 
 from ui.utils.base_ui_test import BaseUITest
 from ui.utils.test_helpers import UITestHelpers
+from utils.navigation_manager import app_state
+from screens.system_selection import SystemSelectionScreen
+
+def _ui_test(label):
+    """Decorate a test method to log its start and turn any exception into a failed result"""
+    def decorator(test):
+        def wrapper(self):
+            self.log_info("Testing %s...", label)
+            try:
+                return test(self)
+            except Exception as e:
+                self.log_error("%s test failed: %s", label.capitalize(), e)
+                return False
+        # No functools.wraps on MicroPython; copy the name by hand so results
+        # report the test, not "wrapper" (some ports reject function attributes)
+        try:
+            wrapper.__name__ = test.__name__
+            wrapper.__doc__ = test.__doc__
+        except AttributeError:
+            pass
+        return wrapper
+    return decorator
 
 class SystemSelectionUITest(BaseUITest):
     """Test suite for System Selection Screen UI functionality"""
@@ -22,28 +44,23 @@ class SystemSelectionUITest(BaseUITest):
         super().__init__("System Selection UI Test")
         self.selection_screen = None
         self.app_state = None
+        # Widgets of selection_screen, looked up once by _cache_widgets()
+        self.list_container = None
+        self.search_display = None
+        self.back_btn = None
     
     def setup_test_environment(self):
         """Set up test environment with system selection screen"""
         try:
-            # Import required modules
-            from utils.navigation_manager import AppState, app_state
-            from utils.data_manager import DataManager
-            from utils.error_handler import ErrorHandler
-            from screens.system_selection import SystemSelectionScreen
-
-            # Use global app_state instance and initialize it
+            # Use global app_state instance
             self.app_state = app_state
-            if not hasattr(self.app_state, 'data_manager') or not self.app_state.data_manager:
-                self.app_state.data_manager = DataManager()
-            if not hasattr(self.app_state, 'error_handler') or not self.app_state.error_handler:
-                self.app_state.error_handler = ErrorHandler()
 
-            # Create system selection screen
+            # Create system selection screen, shared by all tests
             self.selection_screen = SystemSelectionScreen(self.screen)
+            self._cache_widgets()
 
             # Wait for screen to initialize
-            self.wait_for_ui_update(500)
+            self.wait_for_ui_idle()
 
             self.log_pass("System Selection test environment setup completed")
             return True
@@ -52,304 +69,208 @@ class SystemSelectionUITest(BaseUITest):
             self.log_error(f"Test environment setup failed: {e}")
             return False
     
+    def _cache_widgets(self):
+        """Keep direct references to the widgets every test uses"""
+        widgets = self.selection_screen.widgets
+        self.list_container = widgets.get('list_container')
+        self.search_display = widgets.get('search_display')
+        self.back_btn = widgets.get('back_btn')
+    
+    def expected_list_count(self, brand=None):
+        """Number of list entries DataManager implies for the brand view, or for brand's systems"""
+        data_manager = self.app_state.data_manager
+        if brand is None:
+            return len(data_manager.get_brands())
+        count = 0
+        for system_type in data_manager.get_system_types(brand):
+            count += len(data_manager.get_system_names(brand, system_type))
+        return count
+    
+    @_ui_test("initial screen elements")
     def test_initial_screen_elements(self):
-        """Test initial screen elements (step 1 - brand selection)"""
-        try:
-            self.log_info("Testing initial screen elements...")
-            
-            # Check title
-            title = self.selection_screen.widgets.get('title')
-            if not self.verify_widget_visible(title, "title"):
-                return False
-            
-            if not self.verify_widget_text(title, "Select Vehicle Brand", "title"):
-                return False
-            
-            # Check breadcrumb
-            breadcrumb = self.selection_screen.widgets.get('breadcrumb')
-            if not self.verify_widget_visible(breadcrumb, "breadcrumb"):
-                return False
-            
-            if not self.verify_widget_text(breadcrumb, "Step 1 of 4: Brand", "breadcrumb"):
-                return False
-            
-            # Check selection container
-            selection_container = self.selection_screen.widgets.get('selection_container')
-            if not self.verify_widget_visible(selection_container, "selection container"):
-                return False
-            
-            # Check navigation buttons
-            back_btn = self.selection_screen.widgets.get('back_btn')
-            cancel_btn = self.selection_screen.widgets.get('cancel_btn')
-            
-            if not self.verify_widget_visible(cancel_btn, "cancel button"):
-                return False
-            
-            # Back button should be hidden on first step
-            if back_btn and back_btn.has_flag(lv.obj.FLAG.HIDDEN):
-                self.log_pass("Back button is hidden on first step")
-            else:
-                self.log_fail("Back button should be hidden on first step")
-            
-            self.log_pass("Initial screen elements test completed")
-            return True
-            
-        except Exception as e:
-            self.log_error(f"Initial screen elements test failed: {e}")
+        """Test initial screen elements (brand list)"""
+        ss = self.selection_screen
+        
+        # Check list, search and back button
+        list_container = self.list_container
+        if not self.verify_widget_visible(list_container, "list container"):
+            return False
+        
+        if not self.verify_widget_visible(self.search_display, "search display"):
+            return False
+        
+        if not self.verify_widget_visible(self.back_btn, "back button"):
+            return False
+        
+        # Screen opens on the brand list
+        if ss.current_view != "brands":
+            self.log_fail(f"Expected brands view, got {ss.current_view}")
             return False
+        
+        expected = self.expected_list_count()
+        shown = list_container.get_child_cnt()
+        if shown == expected:
+            self.log_pass(f"Brand list shows {shown} brands")
+        else:
+            self.log_fail(f"Expected {expected} brands, list shows {shown}")
+            return False
+        
+        self.log_pass("Initial screen elements test completed")
+        return True
     
+    @_ui_test("brand selection")
     def test_brand_selection_step(self):
-        """Test brand selection (step 1)"""
-        try:
-            self.log_info("Testing brand selection step...")
-            
-            # Should be on step 0 (brand selection)
-            if self.selection_screen.selection_step != 0:
-                self.log_fail(f"Expected step 0, got step {self.selection_screen.selection_step}")
-                return False
-            
-            # Look for brand buttons in selection container
-            selection_container = self.selection_screen.widgets.get('selection_container')
-            brand_buttons = UITestHelpers.get_all_buttons(selection_container)
-            
-            if len(brand_buttons) > 0:
-                self.log_pass(f"Found {len(brand_buttons)} brand selection buttons")
-                
-                # Click first brand button
-                first_brand_btn = brand_buttons[0]
-                if not self.simulate_click(first_brand_btn):
-                    return False
-                
-                # Wait for step transition
-                self.wait_for_ui_update(500)
-                
-                # Should now be on step 1 (system selection)
-                if self.selection_screen.selection_step == 1:
-                    self.log_pass("Advanced to step 1 after brand selection")
-                else:
-                    self.log_fail(f"Expected step 1, got step {self.selection_screen.selection_step}")
-                
-                # Check if selected brand is stored
-                if self.selection_screen.selected_brand:
-                    self.log_pass(f"Brand selected: {self.selection_screen.selected_brand}")
-                else:
-                    self.log_fail("No brand was selected")
-                
-                return True
-            else:
-                self.log_fail("No brand selection buttons found")
-                return False
-                
-        except Exception as e:
-            self.log_error(f"Brand selection test failed: {e}")
+        """Test brand selection switches to that brand's systems"""
+        ss = self.selection_screen
+        
+        if ss.current_view != "brands":
+            self.log_fail(f"Expected brands view, got {ss.current_view}")
             return False
-    
-    def test_system_type_selection_step(self):
-        """Test system type selection (step 2)"""
-        try:
-            self.log_info("Testing system type selection step...")
-            
-            # Should be on step 1 (system type selection)
-            if self.selection_screen.selection_step != 1:
-                self.log_fail(f"Expected step 1, got step {self.selection_screen.selection_step}")
-                return False
-            
-            # Check title updated
-            title = self.selection_screen.widgets.get('title')
-            if not self.verify_widget_text(title, "Select System Type", "title"):
-                return False
-            
-            # Check breadcrumb updated
-            breadcrumb = self.selection_screen.widgets.get('breadcrumb')
-            breadcrumb_text = breadcrumb.get_text()
-            if "Step 2 of 4" in breadcrumb_text:
-                self.log_pass("Breadcrumb shows step 2")
-            else:
-                self.log_fail("Breadcrumb does not show step 2")
-            
-            # Back button should now be visible
-            back_btn = self.selection_screen.widgets.get('back_btn')
-            if back_btn and not back_btn.has_flag(lv.obj.FLAG.HIDDEN):
-                self.log_pass("Back button is visible on step 2")
-            else:
-                self.log_fail("Back button should be visible on step 2")
-            
-            # Look for system type buttons
-            selection_container = self.selection_screen.widgets.get('selection_container')
-            system_buttons = UITestHelpers.get_all_buttons(selection_container)
-            
-            if len(system_buttons) > 0:
-                self.log_pass(f"Found {len(system_buttons)} system type buttons")
-                
-                # Click first system type button
-                first_system_btn = system_buttons[0]
-                if not self.simulate_click(first_system_btn):
-                    return False
-                
-                # Wait for step transition
-                self.wait_for_ui_update(500)
-                
-                # Should now be on step 2 (system name selection)
-                if self.selection_screen.selection_step == 2:
-                    self.log_pass("Advanced to step 2 after system type selection")
-                else:
-                    self.log_fail(f"Expected step 2, got step {self.selection_screen.selection_step}")
-                
-                return True
-            else:
-                self.log_fail("No system type buttons found")
-                return False
-                
-        except Exception as e:
-            self.log_error(f"System type selection test failed: {e}")
+        
+        # Look for brand buttons in the list
+        list_container = self.list_container
+        first_brand_btn = UITestHelpers.first_button(list_container)
+        
+        if first_brand_btn is None:
+            self.log_fail("No brand selection buttons found")
             return False
-    
-    def test_back_navigation(self):
-        """Test back button navigation"""
-        try:
-            self.log_info("Testing back navigation...")
-            
-            current_step = self.selection_screen.selection_step
-            if current_step <= 0:
-                self.log_info("Cannot test back navigation from step 0")
-                return True
-            
-            # Click back button
-            back_btn = self.selection_screen.widgets.get('back_btn')
-            if not back_btn:
-                self.log_fail("Back button not found")
-                return False
-            
-            if not self.simulate_click(back_btn):
-                return False
-            
-            # Wait for navigation
-            self.wait_for_ui_update(300)
-            
-            # Should be on previous step
-            new_step = self.selection_screen.selection_step
-            if new_step == current_step - 1:
-                self.log_pass(f"Successfully navigated back from step {current_step} to step {new_step}")
-                return True
-            else:
-                self.log_fail(f"Back navigation failed. Expected step {current_step - 1}, got step {new_step}")
-                return False
-                
-        except Exception as e:
-            self.log_error(f"Back navigation test failed: {e}")
+        
+        self.log_pass(f"Found brand selection buttons ({list_container.get_child_cnt()} items)")
+        
+        # Click first brand button
+        if not self.simulate_click(first_brand_btn):
+            return False
+        
+        # Should now show the systems of the selected brand
+        if self.wait_until(lambda: ss.current_view == "systems", 500):
+            self.log_pass("Switched to systems view after brand selection")
+        else:
+            self.log_fail(f"Expected systems view, got {ss.current_view}")
             return False
+        
+        if not ss.selected_brand:
+            self.log_fail("No brand was selected")
+            return False
+        self.log_pass(f"Brand selected: {ss.selected_brand}")
+        
+        expected = self.expected_list_count(ss.selected_brand)
+        shown = list_container.get_child_cnt()
+        if shown == expected:
+            self.log_pass(f"Systems list shows {shown} entries")
+            return True
+        self.log_fail(f"Expected {expected} systems for {ss.selected_brand}, list shows {shown}")
+        return False
     
-    def test_cancel_navigation(self):
-        """Test cancel button navigation"""
-        try:
-            self.log_info("Testing cancel navigation...")
-            
-            cancel_btn = self.selection_screen.widgets.get('cancel_btn')
-            if not cancel_btn:
-                self.log_fail("Cancel button not found")
-                return False
-            
-            if not self.simulate_click(cancel_btn):
-                return False
-            
-            self.log_pass("Cancel button click simulation completed")
+    @_ui_test("back navigation")
+    def test_back_navigation(self):
+        """Test back button returns from the systems view to the brand list"""
+        ss = self.selection_screen
+        
+        if ss.current_view != "systems":
+            self.log_info("Cannot test back navigation from the brand list")
             return True
-            
-        except Exception as e:
-            self.log_error(f"Cancel navigation test failed: {e}")
+        
+        # Click back button
+        back_btn = self.back_btn
+        if not back_btn:
+            self.log_fail("Back button not found")
+            return False
+        
+        if not self.simulate_click(back_btn):
             return False
+        
+        # Should be back on the brand list with nothing selected
+        if not self.wait_until(lambda: ss.current_view == "brands", 300):
+            self.log_fail(f"Back navigation failed. Expected brands view, got {ss.current_view}")
+            return False
+        
+        if ss.selected_brand is not None:
+            self.log_fail(f"Selected brand not cleared: {ss.selected_brand}")
+            return False
+        
+        expected = self.expected_list_count()
+        shown = self.list_container.get_child_cnt()
+        if shown != expected:
+            self.log_fail(f"Expected {expected} brands after back, list shows {shown}")
+            return False
+        
+        self.log_pass("Successfully navigated back to the brand list")
+        return True
     
+    @_ui_test("complete selection flow")
     def test_complete_selection_flow(self):
         """Test complete selection flow from brand to tool"""
-        try:
-            self.log_info("Testing complete selection flow...")
-            
-            # Reset to beginning
-            self.selection_screen.selection_step = 0
-            self.selection_screen.selected_brand = None
-            self.selection_screen.selected_system = None
-            self.selection_screen.selected_system_name = None
-            self.selection_screen.selected_tool = None
-            self.selection_screen.update_selection_step()
-            
-            self.wait_for_ui_update(300)
-            
-            # Step 1: Select brand
-            selection_container = self.selection_screen.widgets.get('selection_container')
-            brand_buttons = UITestHelpers.get_all_buttons(selection_container)
-            
-            if len(brand_buttons) > 0:
-                self.simulate_click(brand_buttons[0])
-                self.wait_for_ui_update(500)
-                
-                if self.selection_screen.selection_step == 1:
-                    self.log_pass("Step 1 completed: Brand selected")
-                else:
-                    self.log_fail("Step 1 failed: Brand not selected")
-                    return False
-            else:
-                self.log_fail("No brand buttons found for complete flow test")
-                return False
-            
-            # Step 2: Select system type
-            system_buttons = UITestHelpers.get_all_buttons(selection_container)
-            if len(system_buttons) > 0:
-                self.simulate_click(system_buttons[0])
-                self.wait_for_ui_update(500)
-                
-                if self.selection_screen.selection_step == 2:
-                    self.log_pass("Step 2 completed: System type selected")
-                else:
-                    self.log_fail("Step 2 failed: System type not selected")
-                    return False
-            else:
-                self.log_fail("No system type buttons found")
-                return False
-            
-            # Note: Steps 3 and 4 would require actual data from database
-            # For now, we test the navigation structure
-            
-            self.log_pass("Complete selection flow test completed (partial)")
-            return True
-            
-        except Exception as e:
-            self.log_error(f"Complete selection flow test failed: {e}")
+        ss = self.selection_screen
+        
+        # Brand clicks are covered by the step tests above; select the brand
+        # directly and check the systems list the screen builds for it
+        ss.reset_state()
+        data_manager = self.app_state.data_manager
+        brand = data_manager.first_brand
+        if brand is None:
+            self.log_fail("No brand data found for complete flow test")
             return False
+        
+        ss.selected_brand = brand
+        ss.current_view = "systems"
+        ss.update_list_display()
+        
+        list_container = self.list_container
+        if list_container is None:
+            self.log_fail("List container not found")
+            return False
+        
+        expected = self.expected_list_count(brand)
+        shown = list_container.get_child_cnt()
+        if shown != expected:
+            self.log_fail(f"Expected {expected} systems for {brand}, list shows {shown}")
+            return False
+        
+        self.log_pass(f"Systems list for {brand} shows {shown} entries")
+        
+        # Picking a system navigates away through check_tools_and_navigate;
+        # that needs tool data and a registered main screen, so it stops here
+        self.log_pass("Complete selection flow test completed (partial)")
+        return True
     
-    def test_breadcrumb_updates(self):
-        """Test breadcrumb navigation updates"""
-        try:
-            self.log_info("Testing breadcrumb updates...")
-            
-            breadcrumb = self.selection_screen.widgets.get('breadcrumb')
-            if not breadcrumb:
-                self.log_fail("Breadcrumb not found")
-                return False
-            
-            # Test breadcrumb for different steps
-            test_steps = [
-                (0, "Step 1 of 4: Brand"),
-                (1, "Step 2 of 4"),
-                (2, "Step 3 of 4"),
-                (3, "Step 4 of 4")
-            ]
-            
-            for step, expected_text in test_steps:
-                self.selection_screen.selection_step = step
-                self.selection_screen.update_selection_step()
-                self.wait_for_ui_update(200)
-                
-                breadcrumb_text = breadcrumb.get_text()
-                if expected_text in breadcrumb_text:
-                    self.log_pass(f"Breadcrumb correct for step {step}")
-                else:
-                    self.log_fail(f"Breadcrumb incorrect for step {step}. Expected: '{expected_text}', Got: '{breadcrumb_text}'")
-            
-            return True
-            
-        except Exception as e:
-            self.log_error(f"Breadcrumb updates test failed: {e}")
+    # (current_view, whether the view shows the first brand's systems)
+    _LIST_VIEWS = (
+        ("brands", False),
+        ("systems", True),
+        ("brands", False),
+    )
+    
+    @_ui_test("list updates")
+    def test_list_updates(self):
+        """Test the list is rebuilt for each view"""
+        ss = self.selection_screen
+        list_container = self.list_container
+        if not list_container:
+            self.log_fail("List container not found")
+            return False
+        
+        brand = self.app_state.data_manager.first_brand
+        if brand is None:
+            self.log_fail("No brand data found for list update test")
             return False
+        
+        # update_list_display() rebuilds the list synchronously, so it can be
+        # read back without pumping LVGL
+        ss.reset_state()
+        update_list_display = ss.update_list_display
+        for view, with_brand in self._LIST_VIEWS:
+            ss.current_view = view
+            ss.selected_brand = brand if with_brand else None
+            update_list_display()
+            
+            expected = self.expected_list_count(ss.selected_brand)
+            shown = list_container.get_child_cnt()
+            if shown == expected:
+                self.log_pass(f"List correct for {view} view ({shown} entries)")
+            else:
+                self.log_fail(f"List incorrect for {view} view. Expected {expected} entries, got {shown}")
+        
+        return True
     
     def run_all_tests(self):
         """Run all system selection tests"""
@@ -364,20 +285,17 @@ class SystemSelectionUITest(BaseUITest):
             tests = [
                 self.test_initial_screen_elements,
                 self.test_brand_selection_step,
-                self.test_system_type_selection_step,
                 self.test_back_navigation,
-                self.test_cancel_navigation,
-                self.test_breadcrumb_updates,
+                self.test_list_updates,
                 self.test_complete_selection_flow
             ]
             
+            # _ui_test turns exceptions into a False result, so nothing raises here
             passed_tests = 0
             for test in tests:
-                try:
-                    if test():
-                        passed_tests += 1
-                except Exception as e:
-                    self.log_error(f"Test {test.__name__} crashed: {e}")
+                if test():
+                    passed_tests += 1
+                self.flush_log()
             
             # Print summary
             self.log_info(f"Completed {passed_tests}/{len(tests)} tests successfully")
@@ -385,9 +303,6 @@ class SystemSelectionUITest(BaseUITest):
             
             return passed_tests == len(tests)
             
-        except Exception as e:
-            self.log_error(f"Test execution failed: {e}")
-            return False
         finally:
             self.cleanup()
 
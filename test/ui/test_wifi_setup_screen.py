@@ -368,6 +368,7 @@ class WiFiSetupUITest(BaseUITest):
                         passed_tests += 1
                 except Exception as e:
                     self.log_error(f"Test {test.__name__} crashed: {e}")
+                self.flush_log()
             
             # Print summary
             self.log_info(f"Completed {passed_tests}/{len(tests)} tests successfully")
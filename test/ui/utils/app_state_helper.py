@@ -0,0 +1,21 @@
+"""
+Shared navigation setup for UI tests
+"""
+
+_screens_registered = False
+
+def register_all_screens():
+    """Register the screens the integration tests navigate between, once per process"""
+    global _screens_registered
+    if _screens_registered:
+        return
+    from utils.navigation_manager import nav_manager
+    from screens.main_screen import MainScreen
+    from screens.system_selection import SystemSelectionScreen
+    from screens.wifi_setup import WifiSetupScreen
+    from screens.firmware_update import FirmwareUpdateScreen
+    nav_manager.register_screen("main", MainScreen)
+    nav_manager.register_screen("system_selection", SystemSelectionScreen)
+    nav_manager.register_screen("wifi_setup", WifiSetupScreen)
+    nav_manager.register_screen("firmware_update", FirmwareUpdateScreen)
+    _screens_registered = True
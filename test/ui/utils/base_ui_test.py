@@ -12,35 +12,104 @@ except ImportError:
     import time
     import sys
     import json
+import gc
 import lvgl as lv
 
 # Add src directory to path for imports
 sys.path.append('src')
 
+# LVGL and the SDL window/mouse are process-wide, created once by shared_display()
+_display = None
+_mouse = None
+
+# task_handler delays at or above this mean no timer (refresh, animation) is pending
+_IDLE_MS = 1000
+
+def shared_display(title="ECU Tool Test"):
+    """Initialize LVGL and the SDL window and mouse once per process; returns (display, mouse)"""
+    global _display, _mouse
+    if _display is None:
+        lv.init()
+        _display = lv.sdl_window_create(800, 480)
+        lv.sdl_window_set_resizeable(_display, False)
+        _mouse = lv.sdl_mouse_create()
+    lv.sdl_window_set_title(_display, title)
+    return _display, _mouse
+
+class ManagedScreen:
+    """Context manager that builds a screen and always releases it"""
+    
+    def __init__(self, screen_cls, parent, test):
+        self.screen_cls = screen_cls
+        self.parent = parent
+        self.test = test
+        self.instance = None
+    
+    def __enter__(self):
+        self.instance = self.screen_cls(self.parent)
+        return self.instance
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Clean up even when the test body raised, then reclaim LVGL objects
+        instance = self.instance
+        self.instance = None
+        try:
+            if instance is not None and hasattr(instance, 'cleanup'):
+                instance.cleanup()
+            else:
+                # No cleanup() (or construction failed): drop the widgets left on
+                # the shared parent so later text lookups cannot match them
+                self.parent.clean()
+        except Exception as e:
+            self.test.log_error("Screen cleanup failed: %s", e)
+        gc.collect()
+        return False
+
+class BatchedUI:
+    """Context manager that defers UI waits and drains LVGL once on exit"""
+    
+    def __init__(self, test, until=None, timeout_ms=500):
+        self.test = test
+        self.until = until
+        self.timeout_ms = timeout_ms
+    
+    def __enter__(self):
+        self.test._defer_ui = True
+        return self.test
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.test._defer_ui = False
+        if self.until is not None:
+            self.test.wait_until(self.until, self.timeout_ms)
+        else:
+            self.test.wait_for_ui_update(self.timeout_ms)
+        return False
+
 class BaseUITest:
     """Base class for UI testing with LVGL simulation"""
     
+    # Log levels; set LOG_LEVEL = LOG_RESULT to drop INFO lines before formatting
+    LOG_INFO = 0
+    LOG_RESULT = 1
+    LOG_LEVEL = LOG_INFO
+    
     def __init__(self, test_name="UI Test"):
         self.test_name = test_name
         self.display = None
         self.mouse = None
         self.screen = None
         self.test_results = []
+        # Log lines are buffered and written in one go by flush_log()
+        self._log_buf = []
+        # Set inside batched_ui() to make wait_for_ui_update a no-op
+        self._defer_ui = False
         self.setup_display()
     
     def setup_display(self):
         """Initialize LVGL display and input for testing"""
         try:
-            # Initialize LVGL
-            lv.init()
-            
-            # Create display driver
-            self.display = lv.sdl_window_create(800, 480)
-            lv.sdl_window_set_resizeable(self.display, False)
-            lv.sdl_window_set_title(self.display, f"ECU Tool Test - {self.test_name}")
-            
-            # Create input driver
-            self.mouse = lv.sdl_mouse_create()
+            # Initialize LVGL, display and input driver (shared by every test in the process)
+            self.display, self.mouse = shared_display(f"ECU Tool Test - {self.test_name}")
             
             # Create main screen
             self.screen = lv.screen_active()
@@ -48,41 +117,98 @@ class BaseUITest:
         except Exception as e:
             self.log_error(f"Display setup failed: {e}")
     
-    def log_result(self, status, message):
-        """Log test result"""
+    def log_result(self, status, message, *args):
+        """Log test result; message is %-formatted with args when any are given"""
+        if args:
+            message = message % args
         result = {
             'status': status,
             'message': message,
             'timestamp': time.time()
         }
         self.test_results.append(result)
-        print(f"[{status}] {message}")
+        self._log_buf.append(f"[{status}] {message}")
     
-    def log_pass(self, message):
+    def flush_log(self):
+        """Write buffered log lines with a single print"""
+        if self._log_buf:
+            print('\n'.join(self._log_buf))
+            self._log_buf.clear()
+    
+    def log_pass(self, message, *args):
         """Log successful test"""
-        self.log_result("PASS", message)
+        self.log_result("PASS", message, *args)
     
-    def log_fail(self, message):
+    def log_fail(self, message, *args):
         """Log failed test"""
-        self.log_result("FAIL", message)
+        self.log_result("FAIL", message, *args)
     
-    def log_error(self, message):
+    def log_error(self, message, *args):
         """Log error"""
-        self.log_result("ERROR", message)
+        self.log_result("ERROR", message, *args)
     
-    def log_info(self, message):
-        """Log information"""
-        self.log_result("INFO", message)
+    def log_info(self, message, *args):
+        """Log information, skipped without formatting when LOG_LEVEL is above LOG_INFO"""
+        if self.LOG_LEVEL > self.LOG_INFO:
+            return
+        self.log_result("INFO", message, *args)
     
     def wait_for_ui_update(self, duration_ms=100):
-        """Wait for UI to update"""
+        """Pump LVGL for up to duration_ms, returning early once no timer is due within the budget; False on error"""
+        if self._defer_ui:
+            return True
         try:
             start_time = time.ticks_ms()
-            while time.ticks_diff(time.ticks_ms(), start_time) < duration_ms:
-                lv.task_handler()
-                time.sleep_ms(10)
+            while True:
+                # task_handler returns the time until the next timer is due
+                next_ms = lv.task_handler()
+                remaining = duration_ms - time.ticks_diff(time.ticks_ms(), start_time)
+                if remaining <= 0 or next_ms > remaining:
+                    return True
+                time.sleep_ms(next_ms)
         except Exception as e:
             self.log_error(f"UI update wait failed: {e}")
+            return False
+    
+    def wait_until(self, predicate, timeout_ms=500, poll_ms=5):
+        """Pump LVGL until predicate() is true or timeout elapses"""
+        try:
+            start_time = time.ticks_ms()
+            while True:
+                lv.task_handler()
+                if predicate():
+                    return True
+                if time.ticks_diff(time.ticks_ms(), start_time) >= timeout_ms:
+                    return False
+                time.sleep_ms(poll_ms)
+        except Exception as e:
+            self.log_error(f"UI wait failed: {e}")
+            return False
+    
+    def wait_for_ui_idle(self, timeout_ms=200, poll_ms=5):
+        """Pump LVGL until two consecutive handler runs report no pending timer"""
+        try:
+            start_time = time.ticks_ms()
+            idle_runs = 0
+            while idle_runs < 2:
+                # task_handler returns the time until the next timer is due
+                next_ms = lv.task_handler()
+                idle_runs = idle_runs + 1 if next_ms >= _IDLE_MS else 0
+                if time.ticks_diff(time.ticks_ms(), start_time) >= timeout_ms:
+                    return False
+                time.sleep_ms(poll_ms)
+            return True
+        except Exception as e:
+            self.log_error(f"UI idle wait failed: {e}")
+            return False
+    
+    def batched_ui(self, until=None, timeout_ms=500):
+        """Group interactions so LVGL is pumped once when the block exits, until until() holds if given"""
+        return BatchedUI(self, until, timeout_ms)
+    
+    def managed_screen(self, screen_cls):
+        """Build screen_cls on the test screen, cleaned up when the block exits"""
+        return ManagedScreen(screen_cls, self.screen, self)
     
     def simulate_click(self, widget, wait_ms=200):
         """Simulate click on widget"""
@@ -101,7 +227,7 @@ class BaseUITest:
             lv.event_send(widget, lv.EVENT.CLICKED, None)
             self.wait_for_ui_update(wait_ms)
             
-            self.log_info(f"Clicked widget at ({x}, {y})")
+            self.log_info("Clicked widget at (%d, %d)", x, y)
             return True
             
         except Exception as e:
@@ -122,13 +248,21 @@ class BaseUITest:
             lv.event_send(slider, lv.EVENT.VALUE_CHANGED, None)
             self.wait_for_ui_update(wait_ms)
             
-            self.log_info(f"Set slider value to {value}")
+            self.log_info("Set slider value to %s", value)
             return True
             
         except Exception as e:
             self.log_error(f"Slider simulation failed: {e}")
             return False
     
+    def require_widget(self, screen, name, widget_name=None):
+        """Return screen.widgets[name], logging a failure and returning None if it is missing"""
+        try:
+            return screen.widgets[name]
+        except KeyError:
+            self.log_fail(f"{widget_name or name} not found")
+            return None
+    
     def verify_widget_visible(self, widget, widget_name="widget"):
         """Verify widget is visible"""
         try:
@@ -208,6 +342,7 @@ class BaseUITest:
             self.log_info("Test cleanup completed")
         except Exception as e:
             self.log_error(f"Cleanup failed: {e}")
+        self.flush_log()
     
     def get_test_summary(self):
         """Get test results summary"""
@@ -228,6 +363,7 @@ class BaseUITest:
     
     def print_summary(self):
         """Print test summary"""
+        self.flush_log()
         summary = self.get_test_summary()
         print(f"\n=== {summary['test_name']} Summary ===")
         print(f"Total: {summary['total']}")
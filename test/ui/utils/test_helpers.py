@@ -44,18 +44,93 @@ class UITestHelpers:
             return None
     
     @staticmethod
-    def find_button_by_text(parent, text):
-        """Find button widget by text"""
+    def snapshot(parent):
+        """
+        Walk the widget tree once and classify what it holds
+        Returns a dict with 'labels', 'buttons', 'sliders' lists and 'text_index',
+        'label_index', 'button_index' dicts mapping text to the first matching
+        widget, in the same order find_widget_by_text uses. Take a new snapshot
+        after the tree changes.
+        """
+        snap = {
+            'labels': [],
+            'buttons': [],
+            'sliders': [],
+            'text_index': {},
+            'label_index': {},
+            'button_index': {},
+        }
+        labels = snap['labels']
+        buttons = snap['buttons']
+        sliders = snap['sliders']
+        text_index = snap['text_index']
+        label_index = snap['label_index']
+        button_index = snap['button_index']
+        try:
+            def visit(obj):
+                text = None
+                if hasattr(obj, 'get_text'):
+                    try:
+                        text = obj.get_text()
+                        if text not in text_index:
+                            text_index[text] = obj
+                    except:
+                        text = None
+                if isinstance(obj, lv.label):
+                    labels.append(obj)
+                    if text is not None and text not in label_index:
+                        label_index[text] = obj
+                elif isinstance(obj, lv.button):
+                    buttons.append(obj)
+                    if text is not None and text not in button_index:
+                        button_index[text] = obj
+                elif isinstance(obj, lv.slider):
+                    sliders.append(obj)
+
+                child_count = obj.get_child_cnt()
+                for i in range(child_count):
+                    visit(obj.get_child(i))
+
+            visit(parent)
+
+        except Exception as e:
+            print(f"Widget snapshot failed: {e}")
+        return snap
+
+    @staticmethod
+    def index_widgets(parent):
+        """
+        Walk the widget tree once
+        Returns (text_index, buttons, sliders); text_index maps each text to
+        the first widget carrying it, in the same order find_widget_by_text uses
+        """
+        snap = UITestHelpers.snapshot(parent)
+        return snap['text_index'], snap['buttons'], snap['sliders']
+
+    @staticmethod
+    def build_text_index(parent):
+        """Build a text -> widget index of the widget tree in one pass"""
+        return UITestHelpers.index_widgets(parent)[0]
+
+    @staticmethod
+    def find_button_by_text(parent, text, snap=None):
+        """Find button widget by text, using a precomputed snapshot if given"""
+        if snap is not None:
+            return snap['button_index'].get(text)
         return UITestHelpers.find_widget_by_text(parent, text, lv.button)
     
     @staticmethod
-    def find_label_by_text(parent, text):
-        """Find label widget by text"""
+    def find_label_by_text(parent, text, snap=None):
+        """Find label widget by text, using a precomputed snapshot if given"""
+        if snap is not None:
+            return snap['label_index'].get(text)
         return UITestHelpers.find_widget_by_text(parent, text, lv.label)
     
     @staticmethod
-    def get_all_buttons(parent):
-        """Get all button widgets in parent"""
+    def get_all_buttons(parent, snap=None):
+        """Get all button widgets in parent, using a precomputed snapshot if given"""
+        if snap is not None:
+            return snap['buttons']
         buttons = []
         try:
             def search_buttons(obj):
@@ -75,8 +150,22 @@ class UITestHelpers:
             return []
     
     @staticmethod
-    def get_all_sliders(parent):
-        """Get all slider widgets in parent"""
+    def first_button(parent):
+        """Get the first direct child of parent that is a button, or None"""
+        try:
+            for i in range(parent.get_child_cnt()):
+                child = parent.get_child(i)
+                if isinstance(child, lv.button):
+                    return child
+        except Exception as e:
+            print(f"Button search failed: {e}")
+        return None
+    
+    @staticmethod
+    def get_all_sliders(parent, snap=None):
+        """Get all slider widgets in parent, using a precomputed snapshot if given"""
+        if snap is not None:
+            return snap['sliders']
         sliders = []
         try:
             def search_sliders(obj):
@@ -115,55 +204,112 @@ class UITestHelpers:
             return False
     
     @staticmethod
-    def simulate_navigation_flow(test_instance, steps):
+    def compile_flow(test_instance, steps):
         """
-        Simulate a complete navigation flow
-        steps: list of dicts with 'action', 'target', 'verify' keys
+        Compile navigation steps into a tuple of zero-argument callables
+        Each callable runs one step (action, then verification) and returns
+        True on success; run the plan with run_flow
         """
-        try:
-            for i, step in enumerate(steps):
-                test_instance.log_info(f"Step {i+1}: {step.get('description', 'Navigation step')}")
-                
-                action = step.get('action')
-                target = step.get('target')
-                verify = step.get('verify')
-                
-                if action == 'click':
-                    if not test_instance.simulate_click(target):
-                        test_instance.log_fail(f"Step {i+1}: Click failed")
-                        return False
-                
-                elif action == 'slider':
-                    value = step.get('value', 0)
-                    if not test_instance.simulate_slider_change(target, value):
-                        test_instance.log_fail(f"Step {i+1}: Slider change failed")
-                        return False
-                
-                elif action == 'wait':
-                    duration = step.get('duration', 1000)
+        return tuple(UITestHelpers._compile_step(test_instance, i + 1, step)
+                     for i, step in enumerate(steps))
+    
+    @staticmethod
+    def _step_from_tuple(step):
+        """Expand a compact (action, target or wait duration, slider value) step into a dict"""
+        action, arg, value = step
+        if action == 'wait':
+            return {'description': 'Wait', 'action': action, 'duration': arg}
+        return {'description': action.capitalize(), 'action': action, 'target': arg, 'value': value}
+    
+    @staticmethod
+    def _compile_step(test_instance, number, step):
+        """Compile one navigation step (dict or compact tuple) into a callable"""
+        if isinstance(step, tuple):
+            step = UITestHelpers._step_from_tuple(step)
+        description = step.get('description', 'Navigation step')
+        action = step.get('action')
+        get_target = step.get('get_target') or (lambda target=step.get('target'): target)
+        
+        if action == 'click':
+            def act():
+                if not test_instance.simulate_click(get_target()):
+                    test_instance.log_fail(f"Step {number}: Click failed")
+                    return False
+                return True
+        
+        elif action == 'slider':
+            value = step.get('value', 0)
+            def act():
+                if not test_instance.simulate_slider_change(get_target(), value):
+                    test_instance.log_fail(f"Step {number}: Slider change failed")
+                    return False
+                return True
+        
+        elif action == 'wait':
+            duration = step.get('duration', 1000)
+            until = step.get('until')
+            if until:
+                def act():
+                    test_instance.wait_until(until, duration)
+                    return True
+            else:
+                def act():
                     test_instance.wait_for_ui_update(duration)
-                
-                # Verify step if specified
-                if verify:
-                    verify_type = verify.get('type')
-                    verify_target = verify.get('target')
-                    
-                    if verify_type == 'visible':
-                        if not test_instance.verify_widget_visible(verify_target, verify.get('name', 'widget')):
-                            test_instance.log_fail(f"Step {i+1}: Visibility verification failed")
-                            return False
-                    
-                    elif verify_type == 'text':
-                        expected_text = verify.get('text')
-                        if not test_instance.verify_widget_text(verify_target, expected_text, verify.get('name', 'widget')):
-                            test_instance.log_fail(f"Step {i+1}: Text verification failed")
-                            return False
-                    
-                    elif verify_type == 'state':
-                        expected_state = verify.get('state')
-                        if not test_instance.verify_widget_state(verify_target, expected_state, verify.get('name', 'widget')):
-                            test_instance.log_fail(f"Step {i+1}: State verification failed")
-                            return False
+                    return True
+        
+        else:
+            act = None
+        
+        verify = step.get('verify')
+        check = UITestHelpers._compile_verify(test_instance, number, verify) if verify else None
+        
+        def run():
+            test_instance.log_info("Step %d: %s", number, description)
+            if act is not None and not act():
+                return False
+            return check is None or check()
+        return run
+    
+    @staticmethod
+    def _compile_verify(test_instance, number, verify):
+        """Compile a step's 'verify' dict into a callable"""
+        verify_type = verify.get('type')
+        name = verify.get('name', 'widget')
+        until = verify.get('until')
+        timeout = verify.get('timeout', 500)
+        get_target = verify.get('get_target') or (lambda target=verify.get('target'): target)
+        
+        if verify_type == 'visible':
+            label = "Visibility"
+            check_widget = lambda w: test_instance.verify_widget_visible(w, name)
+        elif verify_type == 'text':
+            label = "Text"
+            expected_text = verify.get('text')
+            check_widget = lambda w: test_instance.verify_widget_text(w, expected_text, name)
+        elif verify_type == 'state':
+            label = "State"
+            expected_state = verify.get('state')
+            check_widget = lambda w: test_instance.verify_widget_state(w, expected_state, name)
+        else:
+            label = None
+            check_widget = None
+        
+        def check():
+            if until:
+                test_instance.wait_until(until, timeout)
+            if check_widget is not None and not check_widget(get_target()):
+                test_instance.log_fail(f"Step {number}: {label} verification failed")
+                return False
+            return True
+        return check
+    
+    @staticmethod
+    def run_flow(test_instance, plan):
+        """Run a plan built by compile_flow, stopping at the first failing step"""
+        try:
+            for step in plan:
+                if not step():
+                    return False
             
             test_instance.log_pass("Navigation flow completed successfully")
             return True
@@ -172,6 +318,23 @@ class UITestHelpers:
             test_instance.log_error(f"Navigation flow failed: {e}")
             return False
     
+    @staticmethod
+    def simulate_navigation_flow(test_instance, steps):
+        """
+        Simulate a complete navigation flow
+        steps: list of dicts with 'action', 'target', 'verify' keys, or compact
+        (action, target or wait duration, slider value) tuples
+        'get_target' may replace 'target' to look the widget up when the step runs;
+        'until' on a wait step or verify dict waits for that predicate instead of sleeping
+        Stops at the first failing step, so later waits are never paid on failure
+        """
+        try:
+            plan = UITestHelpers.compile_flow(test_instance, steps)
+        except Exception as e:
+            test_instance.log_error(f"Navigation flow failed: {e}")
+            return False
+        return UITestHelpers.run_flow(test_instance, plan)
+    
     @staticmethod
     def create_mock_app_state():
         """Create mock app state for testing"""